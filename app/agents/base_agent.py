@@ -16,7 +16,7 @@ from app.evolution.darwin import Genome
 # Import economy system components
 try:
     from app.economy.d8_credits import D8CreditsSystem
-    from app.economy.accounting import AutonomousAccountingSystem
+    from app.economy.accounting import AutonomousAccountingSystem, ExpenseCategory
     ECONOMY_AVAILABLE = True
 except ImportError:
     ECONOMY_AVAILABLE = False
@@ -384,10 +384,9 @@ Respond now with your decision in JSON format:"""
         try:
             # Record expense in accounting system
             self.accounting_system.record_expense(
+                category=ExpenseCategory.API_COSTS,
                 amount=cost,
-                category="api_calls",
-                description=f"Agent {self.agent_id[:8]} - Groq API ({tokens} tokens)",
-                metadata={"agent_id": self.agent_id, "tokens": tokens}
+                description=f"Agent {self.agent_id[:8]} - Groq API ({tokens} tokens)"
             )
             
             # Deduct from wallet
@@ -409,23 +408,13 @@ Respond now with your decision in JSON format:"""
             # Update metrics
             self.metrics.revenue_generated += amount
             
-            # Record in credits system
+            # Record in the credits revenue ledger (accounting only tracks expenses)
             self.credits_system.record_revenue(
                 agent_id=self.agent_id,
                 amount=amount,
-                source=source,
-                metadata={"timestamp": datetime.utcnow().isoformat()}
+                source=source
             )
             
-            # Record in accounting
-            if self.accounting_system:
-                self.accounting_system.record_revenue(
-                    amount=amount,
-                    source=source,
-                    description=f"Agent {self.agent_id[:8]} - {source}",
-                    metadata={"agent_id": self.agent_id}
-                )
-            
             logger.info(f"💰 Revenue recorded: ${amount:.2f} from {source}")
             
         except Exception as e:
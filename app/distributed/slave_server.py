@@ -3,7 +3,7 @@ Slave Server - Flask API for remote task execution
 Runs on each slave machine, receives commands from master
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import subprocess
 import sys
 import os
@@ -12,6 +12,9 @@ import logging
 import json
 from typing import Dict, Any
 import shutil
+import queue
+import threading
+import time
 
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +23,9 @@ logger = logging.getLogger(__name__)
 # Token de autenticación
 SLAVE_TOKEN = os.getenv("SLAVE_TOKEN", "default-dev-token-change-in-production")
 
+# Tiempo máximo de ejecución de un comando (segundos)
+EXECUTION_TIMEOUT = 300  # 5 minutos máximo
+
 
 def get_version_info() -> Dict[str, str]:
     """Lee version_info.json del directorio raíz"""
@@ -69,95 +75,125 @@ def _get_available_methods() -> Dict[str, bool]:
     return methods
 
 
-def _execute_in_docker(command: str, working_dir: str = "/app") -> Dict[str, Any]:
-    """Ejecuta comando en Docker"""
+def _build_argv(method: str, command: str, working_dir: str = None):
+    """Argumentos y cwd para ejecutar command con el método indicado"""
+    root = Path(__file__).parent.parent.parent
+    
+    if method == "docker":
+        return [
+            "docker", "run", "--rm",
+            "-v", f"{root}:/app",
+            "-w", working_dir or "/app",
+            "d8-slave",
+            "python", "-c", command
+        ], None
+    
+    if method == "venv":
+        venv_python = root / "venv" / "Scripts" / "python.exe"
+        if not venv_python.exists():
+            venv_python = root / "venv" / "bin" / "python"
+        return [str(venv_python), "-c", command], working_dir or str(root)
+    
+    return [sys.executable, "-c", command], working_dir or str(root)
+
+
+def _execute(method: str, command: str, working_dir: str = None) -> Dict[str, Any]:
+    """Ejecuta comando con el método indicado y devuelve su salida completa"""
     try:
+        argv, cwd = _build_argv(method, command, working_dir)
         result = subprocess.run(
-            [
-                "docker", "run", "--rm",
-                "-v", f"{Path(__file__).parent.parent.parent}:/app",
-                "-w", working_dir,
-                "d8-slave",
-                "python", "-c", command
-            ],
+            argv,
             capture_output=True,
             text=True,
-            timeout=300  # 5 minutos máximo
+            timeout=EXECUTION_TIMEOUT,
+            cwd=cwd
         )
         
         return {
             "success": result.returncode == 0,
             "output": result.stdout,
             "error": result.stderr,
-            "method": "docker"
+            "method": method
         }
     except Exception as e:
         return {
             "success": False,
             "output": "",
             "error": str(e),
-            "method": "docker"
+            "method": method
         }
 
 
+def _execute_in_docker(command: str, working_dir: str = "/app") -> Dict[str, Any]:
+    """Ejecuta comando en Docker"""
+    return _execute("docker", command, working_dir)
+
+
 def _execute_in_venv(command: str, working_dir: str = None) -> Dict[str, Any]:
     """Ejecuta comando en venv"""
-    try:
-        venv_python = Path(__file__).parent.parent.parent / "venv" / "Scripts" / "python.exe"
-        if not venv_python.exists():
-            venv_python = Path(__file__).parent.parent.parent / "venv" / "bin" / "python"
-        
-        work_dir = working_dir or str(Path(__file__).parent.parent.parent)
-        
-        result = subprocess.run(
-            [str(venv_python), "-c", command],
-            capture_output=True,
-            text=True,
-            timeout=300,
-            cwd=work_dir
-        )
-        
-        return {
-            "success": result.returncode == 0,
-            "output": result.stdout,
-            "error": result.stderr,
-            "method": "venv"
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "output": "",
-            "error": str(e),
-            "method": "venv"
-        }
+    return _execute("venv", command, working_dir)
 
 
 def _execute_in_python(command: str, working_dir: str = None) -> Dict[str, Any]:
     """Ejecuta comando en Python nativo"""
+    return _execute("python", command, working_dir)
+
+
+def _stream_process(argv, cwd, method: str):
+    """
+    Ejecuta el proceso y emite su salida como NDJSON línea a línea
+    
+    Cada línea es {"stream": "stdout"|"stderr", "line": ...}; la última es
+    {"success": bool, "exit_code": int, "method": ...}.
+    """
     try:
-        work_dir = working_dir or str(Path(__file__).parent.parent.parent)
-        
-        result = subprocess.run(
-            [sys.executable, "-c", command],
-            capture_output=True,
+        process = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=300,
-            cwd=work_dir
+            bufsize=1
         )
-        
-        return {
-            "success": result.returncode == 0,
-            "output": result.stdout,
-            "error": result.stderr,
-            "method": "python"
-        }
     except Exception as e:
-        return {
-            "success": False,
-            "output": "",
-            "error": str(e),
-            "method": "python"
-        }
+        yield json.dumps({"success": False, "exit_code": None, "error": str(e), "method": method}) + "\n"
+        return
+    
+    lines = queue.Queue()
+    
+    def _pump(pipe, name):
+        for line in pipe:
+            lines.put((name, line))
+        lines.put((name, None))
+    
+    readers = [
+        threading.Thread(target=_pump, args=(process.stdout, "stdout"), daemon=True),
+        threading.Thread(target=_pump, args=(process.stderr, "stderr"), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+    
+    deadline = time.monotonic() + EXECUTION_TIMEOUT
+    try:
+        open_streams = len(readers)
+        while open_streams:
+            name, line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+            if line is None:
+                open_streams -= 1
+                continue
+            yield json.dumps({"stream": name, "line": line}) + "\n"
+        
+        exit_code = process.wait(timeout=max(deadline - time.monotonic(), 0))
+        yield json.dumps({"success": exit_code == 0, "exit_code": exit_code, "method": method}) + "\n"
+    except (queue.Empty, subprocess.TimeoutExpired):
+        process.kill()
+        error = f"Command timed out after {EXECUTION_TIMEOUT} seconds"
+        yield json.dumps({"success": False, "exit_code": None, "error": error, "method": method}) + "\n"
+    finally:
+        # Cliente desconectado o timeout: no dejar el proceso vivo
+        if process.poll() is None:
+            process.kill()
+        process.wait()
 
 
 @app.route("/api/health", methods=["GET"])
@@ -198,6 +234,16 @@ def execute():
     # Detectar métodos disponibles
     methods = _get_available_methods()
     
+    # Con "stream": la salida se envía como NDJSON mientras se produce
+    if data.get("stream"):
+        method = "docker" if methods["docker"] else "venv" if methods["venv"] else "python"
+        argv, cwd = _build_argv(method, command, working_dir)
+        logger.info(f"📡 Ejecutando en streaming ({method})...")
+        return Response(
+            stream_with_context(_stream_process(argv, cwd, method)),
+            mimetype="application/x-ndjson"
+        )
+    
     # Prioridad: Docker > venv > Python nativo
     result = None
     
@@ -214,6 +260,53 @@ def execute():
     return jsonify(result)
 
 
+@app.route("/api/tail", methods=["GET"])
+def tail():
+    """Transmite las líneas de un archivo a medida que se escriben (tail -F)"""
+    token = request.headers.get("Authorization", "").replace("Bearer ", "")
+    if not _validate_token(token):
+        return jsonify({"error": "Unauthorized"}), 401
+    
+    path = request.args.get("path")
+    if not path:
+        return jsonify({"error": "No path provided"}), 400
+    
+    if not os.path.isfile(path):
+        return jsonify({"error": "File not found"}), 404
+    
+    # Sin "lines" se envía el archivo completo antes de seguirlo
+    lines = request.args.get("lines")
+    try:
+        count = None if lines is None else int(lines)
+    except ValueError:
+        count = -1
+    if count is not None and count < 0:
+        return jsonify({"error": "Invalid lines"}), 400
+    start = "+1" if count is None else str(count)
+    
+    def generate():
+        process = subprocess.Popen(
+            ["tail", "-n", start, "-F", path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        try:
+            for line in process.stdout:
+                yield line
+        finally:
+            # El cliente se desconectó: no dejar tail huérfano ni zombie
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+    
+    return Response(stream_with_context(generate()), mimetype="text/plain")
+
+
 @app.route("/api/install", methods=["POST"])
 def install():
     """Endpoint para instalación remota (placeholder)"""
@@ -209,9 +209,15 @@ class D8EconomySystem:
         Returns:
             Dictionary with health indicators
         """
-        financial_report = self.accounting.generate_financial_report()
-        credits_stats = self.credits.get_stats()
-        collective_fitness = self.attribution.get_collective_fitness()
+        return self._build_system_health(
+            self.accounting.generate_financial_report(),
+            self.credits.get_stats()
+        )
+    
+    def _build_system_health(self, financial_report: dict, credits_stats: dict) -> dict:
+        """Build health dict from an already generated financial report and credits stats"""
+        # The financial report already carries the collective fitness metrics
+        collective_fitness = financial_report['collective_fitness']
         
         congress_balance = self.credits.get_balance("congress")
         
@@ -242,11 +248,14 @@ class D8EconomySystem:
         Returns:
             Complete report dictionary
         """
+        financial_report = self.accounting.generate_financial_report()
+        credits_stats = self.credits.get_stats()
+        
         return {
-            'system_health': self.get_system_health(),
-            'financial_report': self.accounting.generate_financial_report(),
-            'credits_stats': self.credits.get_stats(),
-            'collective_fitness': self.attribution.get_collective_fitness(),
+            'system_health': self._build_system_health(financial_report, credits_stats),
+            'financial_report': financial_report,
+            'credits_stats': credits_stats,
+            'collective_fitness': financial_report['collective_fitness'],
             'top_earners': self.attribution.get_leaderboard('earnings', 10),
             'top_contributors': self.attribution.get_leaderboard('contributions', 10),
             'richest_agents': self.credits.get_richest_agents(10)
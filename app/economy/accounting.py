@@ -6,7 +6,8 @@ Years 1-5: Revenue to Leo (D8 pays expenses from congress budget)
 Year 6+: Agents pay rent to Leo (from their earnings)
 """
 
-from typing import Dict, List, Optional
+from typing import DefaultDict, Dict, List, Optional, Union
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -28,7 +29,7 @@ class ExpenseCategory(Enum):
     EMERGENCY = "emergency"  # Unexpected costs
 
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     """Record of an expense"""
     expense_id: str
@@ -51,7 +52,7 @@ class Expense:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Budget:
     """Budget allocation"""
     category: ExpenseCategory
@@ -91,6 +92,15 @@ class AutonomousAccountingSystem:
         self.expenses: List[Expense] = []
         self.expense_counter = 0
         
+        # Running per-category totals (count/total/paid/unpaid), kept in
+        # step with self.expenses so reports don't rescan every expense
+        self.category_totals: DefaultDict[ExpenseCategory, Dict[str, float]] = defaultdict(
+            lambda: {'count': 0, 'total': 0.0, 'paid': 0.0, 'unpaid': 0.0}
+        )
+        
+        # Per-category index over self.expenses (same Expense objects)
+        self.expenses_by_category: DefaultDict[ExpenseCategory, List[Expense]] = defaultdict(list)
+        
         # Budget management
         self.budgets: Dict[ExpenseCategory, Budget] = {}
         
@@ -114,6 +124,21 @@ class AutonomousAccountingSystem:
         logger.info(f"   Years in operation: {self.years_in_operation}")
         logger.info(f"   Mode: {'Revenue to Leo' if self.years_in_operation < 6 else 'Rent from Agents'}")
     
+    def reset(self):
+        """
+        Clear recorded expenses and alerts (in memory only)
+        
+        Budget allocations are kept with their spent amount set back to 0.
+        """
+        self.expenses.clear()
+        self.expense_counter = 0
+        self.category_totals.clear()
+        self.expenses_by_category.clear()
+        self.alerts_sent.clear()
+        
+        for budget in self.budgets.values():
+            budget.spent = 0.0
+    
     def initialize_monthly_budget(self):
         """Initialize monthly budget allocations"""
         # Default monthly budgets
@@ -160,6 +185,73 @@ class AutonomousAccountingSystem:
         Returns:
             Expense object if successful
         """
+        expense = self._record_expense(category, amount, description, auto_pay)
+        if expense:
+            self._save_state()
+        return expense
+    
+    def record_expenses_batch(self, expenses: List[dict]) -> List[Optional[Expense]]:
+        """
+        Record several expenses and persist state once
+        
+        Args:
+            expenses: List of dicts with record_expense() keyword arguments
+                (category, amount, description and optionally auto_pay)
+            
+        Returns:
+            List with the Expense (or None) for each entry, in order
+        """
+        recorded = [self._record_expense(**data) for data in expenses]
+        
+        if any(recorded):
+            self._save_state()
+        
+        return recorded
+    
+    def record_expenses_bulk(
+        self,
+        category: ExpenseCategory,
+        amounts: List[float],
+        descriptions: List[str],
+        auto_pay: bool = True
+    ) -> List[Optional[Expense]]:
+        """
+        Record several expenses of the same category
+        
+        Args:
+            category: Expense category shared by all expenses
+            amounts: Amount of each expense
+            descriptions: Description of each expense (same length as amounts)
+            auto_pay: Whether to automatically pay
+            
+        Returns:
+            List with the Expense (or None) for each amount, in order
+        """
+        if len(amounts) != len(descriptions):
+            raise ValueError("amounts and descriptions must have the same length")
+        
+        return self.record_expenses_batch([
+            {
+                'category': category,
+                'amount': amount,
+                'description': description,
+                'auto_pay': auto_pay
+            }
+            for amount, description in zip(amounts, descriptions)
+        ])
+    
+    def _record_expense(
+        self,
+        category: ExpenseCategory,
+        amount: float,
+        description: str,
+        auto_pay: bool = True
+    ) -> Optional[Expense]:
+        """Record an expense without persisting state (see record_expense)"""
+        if amount < 0:
+            logger.error(f"❌ Invalid expense amount: {amount}")
+            return None
+        
         self.expense_counter += 1
         
         expense = Expense(
@@ -208,12 +300,61 @@ class AutonomousAccountingSystem:
                     message=f"Budget {category.value} at {utilization:.1f}% utilization"
                 )
         
-        self.expenses.append(expense)
-        self._save_state()
+        self._append_expense(expense)
         
         logger.info(f"📝 Expense recorded: {expense.expense_id} - {amount} D8C ({category.value})")
         return expense
     
+    def _append_expense(self, expense: Expense):
+        """Store an expense and update its category totals"""
+        self.expenses.append(expense)
+        self.expenses_by_category[expense.category].append(expense)
+        
+        totals = self.category_totals[expense.category]
+        totals['count'] += 1
+        totals['total'] += expense.amount
+        totals['paid' if expense.paid else 'unpaid'] += expense.amount
+    
+    def get_expenses(self, category: Union[ExpenseCategory, str]) -> List[Expense]:
+        """
+        Get recorded expenses of one category, in recording order
+        
+        Args:
+            category: ExpenseCategory or its string value
+            
+        Returns:
+            List of expenses
+            
+        Raises:
+            ValueError: If category is not a valid ExpenseCategory value
+        """
+        return list(self.expenses_by_category.get(ExpenseCategory(category), ()))
+    
+    def get_budget_usage(self, category: Union[ExpenseCategory, str]) -> float:
+        """
+        Get the spent fraction of a category's budget (0.25 = 25%)
+        
+        Reads the running Budget.spent total, so it never rescans expenses.
+        Returns 0.0 when the category has no budget.
+        
+        Raises:
+            ValueError: If category is not a valid ExpenseCategory value
+        """
+        budget = self.budgets.get(ExpenseCategory(category))
+        if not budget or budget.allocated == 0:
+            return 0.0
+        return budget.spent / budget.allocated
+    
+    def check_budget_exceeded(self, category: Union[ExpenseCategory, str]) -> bool:
+        """
+        Check whether a category has spent more than its allocation
+        
+        Raises:
+            ValueError: If category is not a valid ExpenseCategory value
+        """
+        budget = self.budgets.get(ExpenseCategory(category))
+        return budget is not None and budget.spent > budget.allocated
+    
     def _pay_expense(self, expense: Expense) -> bool:
         """
         Pay an expense from congress budget
@@ -301,21 +442,18 @@ class AutonomousAccountingSystem:
         Returns:
             Dictionary with financial metrics
         """
-        # Calculate totals
-        total_expenses = sum(e.amount for e in self.expenses)
-        paid_expenses = sum(e.amount for e in self.expenses if e.paid)
-        unpaid_expenses = sum(e.amount for e in self.expenses if not e.paid)
-        
-        # Expenses by category
+        # Expenses by category (from running totals)
         expenses_by_category = {}
         for category in ExpenseCategory:
-            category_expenses = [e for e in self.expenses if e.category == category]
-            expenses_by_category[category.value] = {
-                'count': len(category_expenses),
-                'total': sum(e.amount for e in category_expenses),
-                'paid': sum(e.amount for e in category_expenses if e.paid),
-                'unpaid': sum(e.amount for e in category_expenses if not e.paid)
-            }
+            totals = self.category_totals.get(category)
+            expenses_by_category[category.value] = (
+                dict(totals) if totals else {'count': 0, 'total': 0.0, 'paid': 0.0, 'unpaid': 0.0}
+            )
+        
+        # Calculate totals
+        total_expenses = sum(t['total'] for t in self.category_totals.values())
+        paid_expenses = sum(t['paid'] for t in self.category_totals.values())
+        unpaid_expenses = sum(t['unpaid'] for t in self.category_totals.values())
         
         # Budget status
         budget_status = {}
@@ -412,7 +550,7 @@ class AutonomousAccountingSystem:
                         paid=exp_data['paid'],
                         tx_hash=exp_data.get('tx_hash')
                     )
-                    self.expenses.append(expense)
+                    self._append_expense(expense)
                 
                 # Load budgets
                 for cat_str, budget_data in data.get('budgets', {}).items():
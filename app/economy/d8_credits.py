@@ -4,16 +4,19 @@ Manages agent wallets, balances, and transactions
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from operator import itemgetter
+import heapq
 import json
 from pathlib import Path
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Record of a D8 Credit transaction"""
     tx_id: str
@@ -38,7 +41,7 @@ class Transaction:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentWallet:
     """Agent's D8 Credit wallet"""
     agent_id: str
@@ -98,6 +101,7 @@ class D8CreditsSystem:
         
         # Wallets storage
         self.wallets: Dict[str, AgentWallet] = {}
+        self.address_to_agent: Dict[str, str] = {}  # wallet address -> agent_id
         
         # Congress wallet (manages rewards distribution)
         self.congress_address = None
@@ -106,6 +110,9 @@ class D8CreditsSystem:
         # Transaction counter
         self.tx_counter = 0
         
+        # Revenue reported by agents (off-chain ledger, agent_id -> total)
+        self.revenue_totals: Dict[str, float] = {}
+        
         # Load wallets from file
         self._load_wallets()
         
@@ -121,10 +128,48 @@ class D8CreditsSystem:
         Returns:
             New AgentWallet instance
         """
+        wallet = self._new_wallet(agent_id)
+        
+        # Store wallet
+        self._store_wallet(wallet)
+        self._save_wallets()
+        
+        logger.info(f"💼 Wallet created for {agent_id}: {wallet.address}")
+        return wallet
+    
+    def create_wallets_bulk(self, agent_ids: List[str]) -> List[AgentWallet]:
+        """
+        Create wallets for several agents at once
+        
+        Same as calling create_wallet() per agent, but the wallets file
+        is written once for the whole batch instead of once per wallet.
+        
+        Args:
+            agent_ids: Agent identifiers
+        
+        Returns:
+            List of new AgentWallet instances (same order as agent_ids)
+        """
+        wallets = []
+        
+        for agent_id in agent_ids:
+            wallet = self._new_wallet(agent_id)
+            self._store_wallet(wallet)
+            wallets.append(wallet)
+        
+        self._save_wallets()
+        
+        logger.info(f"💼 {len(wallets)} wallets created")
+        return wallets
+    
+    def _new_wallet(self, agent_id: str) -> AgentWallet:
+        """Create a wallet on a fresh account and register it on-chain (not stored)"""
+        # Wallets are looked up by agent_id constantly; intern the key
+        agent_id = sys.intern(agent_id)
+        
         # Generate new blockchain account
         account = self.bsc.create_account()
         
-        # Create wallet
         wallet = AgentWallet(
             agent_id=agent_id,
             address=account['address'],
@@ -144,17 +189,38 @@ class D8CreditsSystem:
             except Exception as e:
                 logger.error(f"❌ Failed to register agent on blockchain: {e}")
         
-        # Store wallet
-        self.wallets[agent_id] = wallet
-        self._save_wallets()
-        
-        logger.info(f"💼 Wallet created for {agent_id}: {wallet.address}")
         return wallet
     
+    def create_wallets(self, prefix: str, n: int) -> List[AgentWallet]:
+        """
+        Create n wallets named {prefix}_0 .. {prefix}_{n-1}
+        
+        Args:
+            prefix: Agent id prefix
+            n: Number of wallets to create
+        
+        Returns:
+            List of new AgentWallet instances
+        """
+        return self.create_wallets_bulk([f"{prefix}_{i}" for i in range(n)])
+    
     def get_wallet(self, agent_id: str) -> Optional[AgentWallet]:
         """Get agent's wallet"""
         return self.wallets.get(agent_id)
     
+    def get_agent_id(self, address: str) -> Optional[str]:
+        """Get the agent that owns a wallet address"""
+        return self.address_to_agent.get(address)
+    
+    def _store_wallet(self, wallet: AgentWallet):
+        """Store wallet and keep the address index in sync"""
+        previous = self.wallets.get(wallet.agent_id)
+        if previous is not None:
+            self.address_to_agent.pop(previous.address, None)
+        
+        self.wallets[wallet.agent_id] = wallet
+        self.address_to_agent[wallet.address] = wallet.agent_id
+    
     def get_balance(self, agent_id: str) -> float:
         """Get agent's current balance"""
         wallet = self.wallets.get(agent_id)
@@ -189,6 +255,14 @@ class D8CreditsSystem:
         Returns:
             Transaction object if successful
         """
+        if amount <= 0:
+            logger.error(f"❌ Invalid transfer amount: {amount}")
+            return None
+        
+        if from_agent == to_agent:
+            logger.error(f"❌ Cannot transfer to self: {from_agent}")
+            return None
+        
         from_wallet = self.wallets.get(from_agent)
         to_wallet = self.wallets.get(to_agent)
         
@@ -217,9 +291,8 @@ class D8CreditsSystem:
                 return None
             
             # Create transaction record
-            self.tx_counter += 1
             transaction = Transaction(
-                tx_id=f"D8TX{self.tx_counter:06d}",
+                tx_id=self._next_tx_id(),
                 from_agent=from_agent,
                 to_agent=to_agent,
                 amount=amount,
@@ -245,6 +318,96 @@ class D8CreditsSystem:
             logger.error(f"❌ Transfer failed: {e}")
             return None
     
+    def transfer_many(
+        self,
+        from_agent: str,
+        transfers: List[Tuple[str, float, str]]
+    ) -> List[Optional[Transaction]]:
+        """
+        Transfer D8 Credits from one agent to several recipients
+        
+        The sender's balance is checked once against the total, the
+        transfers go out in one on-chain transaction and the wallets file
+        is written once. Falls back to one transfer() call per recipient
+        when the token client has no batch transfer.
+        
+        Args:
+            from_agent: Sender agent ID
+            transfers: (to_agent, amount, reason) tuples
+            
+        Returns:
+            Transaction (or None) per transfer, in input order
+        """
+        if not hasattr(self.token_client, 'transfer_batch'):
+            return [
+                self.transfer(from_agent, to_agent, amount, reason)
+                for to_agent, amount, reason in transfers
+            ]
+        
+        results: List[Optional[Transaction]] = [None] * len(transfers)
+        
+        from_wallet = self.wallets.get(from_agent)
+        if not from_wallet:
+            logger.error(f"❌ Invalid agent ID: {from_agent}")
+            return results
+        
+        payable = []
+        for index, (to_agent, amount, reason) in enumerate(transfers):
+            to_wallet = self.wallets.get(to_agent)
+            if amount <= 0 or to_agent == from_agent or not to_wallet:
+                logger.error(f"❌ Invalid transfer: {from_agent} → {to_agent}: {amount}")
+                continue
+            payable.append((index, to_wallet, amount, reason))
+        
+        if not payable:
+            return results
+        
+        total = sum(amount for _, _, amount, _ in payable)
+        if from_wallet.balance < total:
+            logger.error(f"❌ Insufficient balance: {from_agent} has {from_wallet.balance}, needs {total}")
+            return results
+        
+        try:
+            tx_hash = self.token_client.transfer_batch(
+                from_wallet.address,
+                from_wallet.private_key,
+                [(to_wallet.address, amount) for _, to_wallet, amount, _ in payable]
+            )
+            
+            # One confirmation for the whole batch
+            receipt = self.bsc.wait_for_receipt(tx_hash)
+            
+            if receipt['status'] != 1:
+                logger.error(f"❌ Batch transfer failed on blockchain")
+                return results
+            
+            now = datetime.now()
+            for index, to_wallet, amount, reason in payable:
+                transaction = Transaction(
+                    tx_id=self._next_tx_id(),
+                    from_agent=from_agent,
+                    to_agent=to_wallet.agent_id,
+                    amount=amount,
+                    reason=reason,
+                    timestamp=now,
+                    block_number=receipt['blockNumber'],
+                    tx_hash=tx_hash
+                )
+                from_wallet.add_transaction(transaction)
+                to_wallet.add_transaction(transaction)
+                results[index] = transaction
+            
+            self._save_wallets()
+            
+            logger.info(f"💸 Batch transfer: {from_agent} → {len(payable)} agents, {total} D8C")
+            logger.info(f"   TX: {tx_hash}")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Batch transfer failed: {e}")
+            return results
+    
     def reward_agent(
         self,
         agent_id: str,
@@ -262,6 +425,10 @@ class D8CreditsSystem:
         Returns:
             Transaction object if successful
         """
+        if amount <= 0:
+            logger.error(f"❌ Invalid reward amount: {amount}")
+            return None
+        
         wallet = self.wallets.get(agent_id)
         
         if not wallet:
@@ -290,9 +457,8 @@ class D8CreditsSystem:
                 return None
             
             # Create transaction record
-            self.tx_counter += 1
             transaction = Transaction(
-                tx_id=f"D8TX{self.tx_counter:06d}",
+                tx_id=self._next_tx_id(),
                 from_agent="congress",
                 to_agent=agent_id,
                 amount=amount,
@@ -315,6 +481,146 @@ class D8CreditsSystem:
             logger.error(f"❌ Reward failed: {e}")
             return None
     
+    def reward_agents_batch(
+        self,
+        rewards: List[Tuple[str, float, str]]
+    ) -> List[Optional[Transaction]]:
+        """
+        Reward several agents from congress in one on-chain transaction
+        
+        Falls back to one reward_agent() call per agent when the token
+        client has no batch distribution.
+        
+        Args:
+            rewards: (agent_id, amount, reason) tuples
+            
+        Returns:
+            Transaction (or None) per reward, in input order
+        """
+        if not hasattr(self.token_client, 'distribute_rewards_batch'):
+            return [
+                self.reward_agent(agent_id, amount, reason)
+                for agent_id, amount, reason in rewards
+            ]
+        
+        if not self.congress_address or not self.congress_private_key:
+            logger.error("❌ Congress wallet not configured")
+            return [None] * len(rewards)
+        
+        results: List[Optional[Transaction]] = [None] * len(rewards)
+        payable = []
+        for index, (agent_id, amount, reason) in enumerate(rewards):
+            if amount <= 0:
+                logger.error(f"❌ Invalid reward amount: {amount}")
+                continue
+            wallet = self.wallets.get(agent_id)
+            if not wallet:
+                logger.error(f"❌ Agent not found: {agent_id}")
+                continue
+            payable.append((index, wallet, amount, reason))
+        
+        if not payable:
+            return results
+        
+        try:
+            tx_hash = self.token_client.distribute_rewards_batch(
+                self.congress_address,
+                self.congress_private_key,
+                [(wallet.address, amount, reason) for _, wallet, amount, reason in payable]
+            )
+            
+            # One confirmation for the whole batch
+            receipt = self.bsc.wait_for_receipt(tx_hash)
+            
+            if receipt['status'] != 1:
+                logger.error(f"❌ Batch reward transaction failed")
+                return results
+            
+            now = datetime.now()
+            for index, wallet, amount, reason in payable:
+                transaction = Transaction(
+                    tx_id=self._next_tx_id(),
+                    from_agent="congress",
+                    to_agent=wallet.agent_id,
+                    amount=amount,
+                    reason=reason,
+                    timestamp=now,
+                    block_number=receipt['blockNumber'],
+                    tx_hash=tx_hash
+                )
+                wallet.add_transaction(transaction)
+                results[index] = transaction
+            
+            self._save_wallets()
+            
+            logger.info(f"🎁 Batch reward: {len(payable)} agents in {tx_hash[:10]}...")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Batch reward failed: {e}")
+            return results
+    
+    def record_revenue(
+        self,
+        agent_id: str,
+        amount: float,
+        source: str
+    ) -> float:
+        """
+        Record revenue generated by an agent (see record_revenues)
+        
+        Returns:
+            Agent's total recorded revenue
+        """
+        self.record_revenues([(agent_id, amount, source)])
+        return self.revenue_totals.get(agent_id, 0.0)
+    
+    def record_revenues(self, entries: List[Tuple[str, float, str]]) -> float:
+        """
+        Record revenue for several agents in one pass
+        
+        Totals are saved with the wallets file, once per call.
+        
+        Args:
+            entries: (agent_id, amount, source) tuples; non-positive
+                amounts are skipped
+            
+        Returns:
+            Total amount recorded
+        """
+        totals = self.revenue_totals
+        recorded = 0.0
+        
+        for agent_id, amount, source in entries:
+            if amount <= 0:
+                logger.error(f"❌ Invalid revenue amount: {amount} ({source})")
+                continue
+            totals[agent_id] = totals.get(agent_id, 0.0) + amount
+            recorded += amount
+        
+        if recorded:
+            self._save_wallets()
+        
+        logger.info(f"💰 Revenue recorded: {recorded:.2f} D8C across {len(entries)} entries")
+        return recorded
+    
+    def get_agent_revenue(self, agent_id: str) -> float:
+        """Get total revenue recorded for an agent"""
+        return self.revenue_totals.get(agent_id, 0.0)
+    
+    def reset(self):
+        """
+        Forget all wallets, transaction ids and revenue (in memory only)
+        
+        The congress wallet and blockchain clients are kept; nothing is
+        written to disk until the next save.
+        """
+        self.wallets.clear()
+        self.address_to_agent.clear()
+        self.revenue_totals.clear()
+        self.tx_counter = 0
+    
     def set_congress_wallet(self, address: str, private_key: str):
         """Set congress wallet for reward distribution"""
         self.congress_address = address
@@ -333,9 +639,8 @@ class D8CreditsSystem:
         Returns:
             List of (agent_id, balance) tuples
         """
-        agents = [(aid, w.balance) for aid, w in self.wallets.items()]
-        agents.sort(key=lambda x: x[1], reverse=True)
-        return agents[:limit]
+        agents = ((aid, w.balance) for aid, w in self.wallets.items())
+        return heapq.nlargest(limit, agents, key=itemgetter(1))
     
     def get_stats(self) -> dict:
         """Get system statistics"""
@@ -347,6 +652,11 @@ class D8CreditsSystem:
             'richest_agents': self.get_richest_agents(5)
         }
     
+    def _next_tx_id(self) -> str:
+        """Allocate the next sequential transaction id (D8TX000001, ...)"""
+        self.tx_counter += 1
+        return f"D8TX{self.tx_counter:06d}"
+    
     def _load_wallets(self):
         """Load wallets from file"""
         wallet_file = Path.home() / "Documents" / "d8_data" / "wallets.json"
@@ -384,7 +694,9 @@ class D8CreditsSystem:
                     )
                     
                     self.wallets[agent_id] = wallet
+                    self.address_to_agent[wallet.address] = agent_id
                 
+                self.revenue_totals.update(data.get('revenue_totals', {}))
                 self.tx_counter = data.get('tx_counter', 0)
                 logger.info(f"📂 Loaded {len(self.wallets)} wallets")
                 
@@ -398,6 +710,7 @@ class D8CreditsSystem:
         
         data = {
             'tx_counter': self.tx_counter,
+            'revenue_totals': self.revenue_totals,
             'wallets': {}
         }
         
@@ -3,8 +3,11 @@ Mock Blockchain for Local Testing
 Simulates BSC blockchain without real network connection
 """
 
-import uuid
-from typing import Dict, List, Optional
+import secrets
+import sys
+from collections import defaultdict, deque
+from itertools import islice
+from typing import DefaultDict, Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -14,44 +17,75 @@ logger = logging.getLogger(__name__)
 class MockTransaction:
     """Mock blockchain transaction"""
     def __init__(self, from_addr: str, to_addr: str, value: float, data: str = ""):
-        self.hash = '0x' + uuid.uuid4().hex[:64]
+        self.hash = '0x' + secrets.token_hex(32)
         self.from_address = from_addr
         self.to_address = to_addr
         self.value = value
         self.data = data
-        self.block_number = MockBlockchain.current_block
+        self.block_number: Optional[int] = None  # Set when added to a chain
         self.timestamp = datetime.now()
         self.status = 1  # Success
 
 
 class MockBlockchain:
-    """Mock blockchain state"""
-    current_block = 1000000
-    transactions: List[MockTransaction] = []
-    balances: Dict[str, float] = {}
-    
-    @classmethod
-    def add_transaction(cls, tx: MockTransaction):
-        cls.transactions.append(tx)
-        cls.current_block += 1
+    """
+    Mock blockchain state
+    
+    Each instance is an independent chain, so separate clients (or tests)
+    don't share transactions or balances. The transaction log is a ring
+    buffer of the last max_transactions entries; balances are kept
+    separately and are never trimmed.
+    """
+    
+    def __init__(self, start_block: int = 1000000, max_transactions: int = 10_000):
+        self.current_block = start_block
+        self.transactions: Deque[MockTransaction] = deque(maxlen=max_transactions)
+        self.balances: DefaultDict[str, float] = defaultdict(float)
+    
+    def add_transaction(self, tx: MockTransaction):
+        tx.block_number = self.current_block
+        self.transactions.append(tx)
+        self.current_block += 1
+        
+        # Update balances (senders the chain has never seen are not debited)
+        if tx.from_address in self.balances:
+            self.balances[tx.from_address] -= tx.value
+        self.balances[tx.to_address] += tx.value
+    
+    def add_batch_transaction(self, tx: MockTransaction, payouts: List[Tuple[str, float]]):
+        """
+        Record one transaction that pays several recipients
+        
+        tx.value must be the sum of the payouts; tx.to_address is only
+        informative (e.g. the contract) and is not credited.
+        """
+        tx.block_number = self.current_block
+        self.transactions.append(tx)
+        self.current_block += 1
         
-        # Update balances
-        if tx.from_address in cls.balances:
-            cls.balances[tx.from_address] -= tx.value
-        if tx.to_address in cls.balances:
-            cls.balances[tx.to_address] += tx.value
-        else:
-            cls.balances[tx.to_address] = tx.value
+        if tx.from_address in self.balances:
+            self.balances[tx.from_address] -= tx.value
+        for address, amount in payouts:
+            self.balances[address] += amount
 
 
 class MockBSCClient:
     """Mock BSC client that simulates blockchain without network"""
     
-    def __init__(self, rpc_url: str = "mock://localhost"):
+    def __init__(
+        self,
+        rpc_url: str = "mock://localhost",
+        blockchain: Optional[MockBlockchain] = None
+    ):
         self.rpc_url = rpc_url
         self.chain_id = 97  # Testnet
+        self.blockchain = blockchain if blockchain is not None else MockBlockchain()
         logger.info("🎭 Mock BSC Client initialized (no real blockchain)")
     
+    def reset(self):
+        """Discard all chain state (transactions, balances, blocks)"""
+        self.blockchain = MockBlockchain()
+    
     def get_chain_id(self) -> int:
         return self.chain_id
     
@@ -60,15 +94,14 @@ class MockBSCClient:
     
     def create_account(self) -> dict:
         """Generate mock wallet"""
-        account_id = uuid.uuid4().hex
         return {
-            'address': '0x' + account_id[:40],
-            'private_key': '0x' + account_id[40:] + uuid.uuid4().hex[:24]
+            'address': sys.intern('0x' + secrets.token_hex(20)),
+            'private_key': '0x' + secrets.token_hex(32)
         }
     
     def get_balance(self, address: str) -> float:
         """Get mock balance"""
-        return MockBlockchain.balances.get(address, 0.0)
+        return self.blockchain.balances.get(address, 0.0)
     
     def send_transaction(
         self,
@@ -80,15 +113,31 @@ class MockBSCClient:
     ) -> str:
         """Send mock transaction"""
         tx = MockTransaction(from_address, to_address, value, data)
-        MockBlockchain.add_transaction(tx)
+        self.blockchain.add_transaction(tx)
         
         logger.info(f"📝 Mock TX: {from_address[:10]}...→{to_address[:10]}... {value} D8C")
         return tx.hash
     
+    def send_batch_transaction(
+        self,
+        from_address: str,
+        private_key: str,
+        to_address: str,
+        payouts: List[Tuple[str, float]],
+        data: str = ""
+    ) -> str:
+        """Send one mock transaction paying several recipients"""
+        total = sum(amount for _, amount in payouts)
+        tx = MockTransaction(from_address, to_address, total, data)
+        self.blockchain.add_batch_transaction(tx, payouts)
+        
+        logger.info(f"📝 Mock batch TX: {from_address[:10]}... → {len(payouts)} recipients, {total} D8C")
+        return tx.hash
+    
     def wait_for_receipt(self, tx_hash: str, timeout: int = 120) -> dict:
         """Mock transaction receipt"""
-        # Find transaction
-        tx = next((t for t in MockBlockchain.transactions if t.hash == tx_hash), None)
+        # Find transaction (newest first: receipts are awaited right after sending)
+        tx = next((t for t in reversed(self.blockchain.transactions) if t.hash == tx_hash), None)
         
         if not tx:
             return {'status': 0, 'blockNumber': 0}
@@ -101,9 +150,13 @@ class MockBSCClient:
             'to': tx.to_address
         }
     
+    def get_recent_txs(self, limit: int = 10) -> List[MockTransaction]:
+        """Get the most recent mock transactions, newest first"""
+        return list(islice(reversed(self.blockchain.transactions), limit))
+    
     def fund_account(self, address: str, amount: float):
         """Fund account with mock tokens"""
-        MockBlockchain.balances[address] = MockBlockchain.balances.get(address, 0.0) + amount
+        self.blockchain.balances[address] += amount
         logger.info(f"💰 Funded {address[:10]}... with {amount} D8C")
 
 
@@ -114,8 +167,14 @@ class MockD8TokenClient:
         self.bsc = bsc_client
         self.contract_address = contract_address
         self.registered_agents: Dict[str, str] = {}  # address -> agent_id
+        self._total_supply = 0.0  # D8C distributed to agents; transfers are zero-sum
         logger.info(f"🪙 Mock D8Token at {contract_address[:10]}...")
     
+    def reset(self):
+        """Forget registered agents and distributed supply"""
+        self.registered_agents.clear()
+        self._total_supply = 0.0
+    
     def register_agent(
         self,
         congress_address: str,
@@ -155,9 +214,36 @@ class MockD8TokenClient:
             f"distributeReward({reason})"
         )
         
+        self._total_supply += amount
+        
         logger.info(f"🎁 Reward: {agent_address[:10]}... +{amount} D8C ({reason})")
         return tx_hash
     
+    def distribute_rewards_batch(
+        self,
+        congress_address: str,
+        congress_private_key: str,
+        rewards: List[Tuple[str, float, str]]
+    ) -> str:
+        """
+        Distribute several rewards in a single transaction (mock)
+        
+        Args:
+            rewards: (agent_address, amount, reason) tuples
+        """
+        tx_hash = self.bsc.send_batch_transaction(
+            congress_address,
+            congress_private_key,
+            self.contract_address,
+            [(address, amount) for address, amount, _ in rewards],
+            f"distributeRewards({len(rewards)})"
+        )
+        
+        self._total_supply += sum(amount for _, amount, _ in rewards)
+        
+        logger.info(f"🎁 Batch reward: {len(rewards)} agents")
+        return tx_hash
+    
     def transfer(
         self,
         from_address: str,
@@ -177,10 +263,37 @@ class MockD8TokenClient:
         logger.info(f"💸 Transfer: {from_address[:10]}...→{to_address[:10]}... {amount} D8C")
         return tx_hash
     
+    def transfer_batch(
+        self,
+        from_address: str,
+        private_key: str,
+        transfers: List[Tuple[str, float]]
+    ) -> str:
+        """
+        Transfer tokens to several recipients in a single transaction (mock)
+        
+        Args:
+            transfers: (to_address, amount) tuples
+        """
+        tx_hash = self.bsc.send_batch_transaction(
+            from_address,
+            private_key,
+            self.contract_address,
+            transfers,
+            f"transferBatch({len(transfers)})"
+        )
+        
+        logger.info(f"💸 Batch transfer: {from_address[:10]}... → {len(transfers)} recipients")
+        return tx_hash
+    
     def get_balance(self, address: str) -> float:
         """Get token balance (mock)"""
         return self.bsc.get_balance(address)
     
+    def get_total_supply(self) -> float:
+        """Get total D8C distributed to agents (mock, O(1))"""
+        return self._total_supply
+    
     def mint(
         self,
         congress_address: str,
@@ -191,7 +304,7 @@ class MockD8TokenClient:
         # Add to congress balance
         self.bsc.fund_account(congress_address, amount)
         
-        tx_hash = '0x' + uuid.uuid4().hex[:64]
+        tx_hash = '0x' + secrets.token_hex(32)
         logger.info(f"🏦 Minted {amount} D8C to congress")
         return tx_hash
 
@@ -246,10 +359,13 @@ class MockFundamentalLawsClient:
         return law['data_hash'] == expected_hash
 
 
-def create_mock_economy_system():
+def create_mock_economy_system(blockchain: Optional[MockBlockchain] = None):
     """
     Create complete mock economy system for local testing
     
+    Args:
+        blockchain: Chain state to use (a fresh MockBlockchain by default)
+    
     Returns:
         D8EconomySystem configured with mock blockchain
     """
@@ -257,11 +373,11 @@ def create_mock_economy_system():
     logger.info("=" * 60)
     
     # 1. Mock blockchain
-    mock_bsc = MockBSCClient()
+    mock_bsc = MockBSCClient(blockchain=blockchain)
     
     # 2. Mock contracts
-    token_address = '0x' + uuid.uuid4().hex[:40]
-    laws_address = '0x' + uuid.uuid4().hex[:40]
+    token_address = '0x' + secrets.token_hex(20)
+    laws_address = '0x' + secrets.token_hex(20)
     
     mock_token = MockD8TokenClient(mock_bsc, token_address)
     
@@ -275,8 +391,6 @@ def create_mock_economy_system():
     
     # Fund congress with initial supply
     mock_bsc.fund_account(congress_address, 10000.0)
-    # Also initialize in MockBlockchain for token transfers
-    MockBlockchain.balances[congress_address] = 10000.0
     
     logger.info(f"💰 Funded {congress_address[:10]}... with 10000.0 D8C")
     logger.info(f"✅ Congress wallet: {congress_address}")
@@ -322,7 +436,6 @@ def create_mock_economy_system():
         
         def record_agent_contribution(self, **kwargs):
             from app.economy.revenue_attribution import AgentContribution
-            from datetime import datetime
             
             contribution = AgentContribution(
                 agent_id=kwargs['agent_id'],
@@ -358,9 +471,14 @@ def create_mock_economy_system():
             }
         
         def get_system_health(self) -> dict:
-            financial_report = self.accounting.generate_financial_report()
-            credits_stats = self.credits.get_stats()
-            collective_fitness = self.attribution.get_collective_fitness()
+            return self._build_system_health(
+                self.accounting.generate_financial_report(),
+                self.credits.get_stats()
+            )
+        
+        def _build_system_health(self, financial_report: dict, credits_stats: dict) -> dict:
+            # The financial report already carries the collective fitness metrics
+            collective_fitness = financial_report['collective_fitness']
             
             congress_balance = self.credits.get_balance("congress")
             
@@ -384,11 +502,14 @@ def create_mock_economy_system():
             }
         
         def generate_full_report(self) -> dict:
+            financial_report = self.accounting.generate_financial_report()
+            credits_stats = self.credits.get_stats()
+            
             return {
-                'system_health': self.get_system_health(),
-                'financial_report': self.accounting.generate_financial_report(),
-                'credits_stats': self.credits.get_stats(),
-                'collective_fitness': self.attribution.get_collective_fitness(),
+                'system_health': self._build_system_health(financial_report, credits_stats),
+                'financial_report': financial_report,
+                'credits_stats': credits_stats,
+                'collective_fitness': financial_report['collective_fitness'],
                 'top_earners': self.attribution.get_leaderboard('earnings', 10),
                 'top_contributors': self.attribution.get_leaderboard('contributions', 10),
                 'richest_agents': self.credits.get_richest_agents(10)
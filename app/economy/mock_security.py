@@ -119,8 +119,15 @@ class MockFundamentalLawsSecurity:
     def __init__(self, bsc_client=None, contract_address=None, encryption_key=None):
         self.encryption = MockLawsEncryption(encryption_key or b"mock_key")
         self.laws = {}
+        # law_id -> (encrypted_data, data_hash) last seen to match
+        self._verified: Dict[str, tuple] = {}
         logger.info("🎭 Mock Fundamental Laws Security")
     
+    def reset(self):
+        """Remove all deployed laws"""
+        self.laws.clear()
+        self._verified.clear()
+    
     def deploy_law(self, law_id: str, law_content: str):
         """Deploy law (mock)"""
         encrypted = self.encryption.encrypt(law_content)
@@ -131,6 +138,7 @@ class MockFundamentalLawsSecurity:
             'data_hash': data_hash,
             'content': law_content
         }
+        self._verified[law_id] = (encrypted, data_hash)
         
         logger.info(f"📜 Deployed mock law: {law_id}")
     
@@ -140,8 +148,19 @@ class MockFundamentalLawsSecurity:
         if not law:
             return False
         
-        current_hash = hashlib.sha256(law['encrypted_data']).hexdigest()
-        return current_hash == law['data_hash']
+        # Bytes are immutable: if neither the data object nor the stored
+        # hash changed since the last successful check, skip rehashing
+        encrypted = law['encrypted_data']
+        verified = self._verified.get(law_id)
+        if verified and verified[0] is encrypted and verified[1] == law['data_hash']:
+            return True
+        
+        current_hash = hashlib.sha256(encrypted).hexdigest()
+        if current_hash != law['data_hash']:
+            return False
+        
+        self._verified[law_id] = (encrypted, law['data_hash'])
+        return True
     
     def get_law_content(self, law_id: str) -> str:
         """Get decrypted law content"""
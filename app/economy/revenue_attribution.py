@@ -13,12 +13,21 @@ Handles collective fitness scenarios
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from operator import attrgetter, itemgetter
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Revenue shares by contributor rank (best, mid, worst) and for a pair
+REVENUE_SPLIT = (0.40, 0.40, 0.20)
+PAIR_SPLIT = (0.70, 0.30)
 
-@dataclass
+# Sort key for (agent_id, value) leaderboard entries
+_BY_VALUE = itemgetter(1)
+
+
+@dataclass(slots=True)
 class AgentContribution:
     """Record of agent's contribution to a fitness event"""
     agent_id: str
@@ -51,7 +60,7 @@ class FitnessEvent:
         # Sort contributors by contribution score
         sorted_contributors = sorted(
             self.contributors,
-            key=lambda x: x.contribution_score,
+            key=attrgetter('contribution_score'),
             reverse=True
         )
         
@@ -63,8 +72,8 @@ class FitnessEvent:
             
         elif len(sorted_contributors) == 2:
             # Split 70/30
-            distribution[sorted_contributors[0].agent_id] = self.revenue_generated * 0.70
-            distribution[sorted_contributors[1].agent_id] = self.revenue_generated * 0.30
+            for contributor, share in zip(sorted_contributors, PAIR_SPLIT):
+                distribution[contributor.agent_id] = self.revenue_generated * share
             
         else:
             # 40/40/20 rule
@@ -72,9 +81,8 @@ class FitnessEvent:
             mid = sorted_contributors[len(sorted_contributors) // 2]
             worst = sorted_contributors[-1]
             
-            distribution[best.agent_id] = self.revenue_generated * 0.40
-            distribution[mid.agent_id] = self.revenue_generated * 0.40
-            distribution[worst.agent_id] = self.revenue_generated * 0.20
+            for contributor, share in zip((best, mid, worst), REVENUE_SPLIT):
+                distribution[contributor.agent_id] = self.revenue_generated * share
             
             # If there are more than 3 contributors, remaining agents get small bonus
             if len(sorted_contributors) > 3:
@@ -107,8 +115,17 @@ class RevenueAttributionSystem:
         self.fitness_events: List[FitnessEvent] = []
         self.event_counter = 0
         
+        # Running per-agent leaderboard stats, updated as events are recorded
+        self.agent_stats: Dict[str, dict] = {}
+        
         logger.info("📊 Revenue Attribution System initialized")
     
+    def reset(self):
+        """Clear recorded fitness events and leaderboard stats"""
+        self.fitness_events.clear()
+        self.event_counter = 0
+        self.agent_stats.clear()
+    
     def record_fitness_event(
         self,
         fitness_score: float,
@@ -143,25 +160,47 @@ class RevenueAttributionSystem:
         
         # Calculate distribution
         distribution = event.get_contribution_distribution()
+        self._update_agent_stats(event, distribution)
         
-        # Distribute rewards
-        for agent_id, amount in distribution.items():
-            reason = f"Fitness event {event.event_id}: {fitness_score:.2f} fitness"
-            if niche:
-                reason += f" (niche: {niche})"
-            
-            self.credits_system.reward_agent(
-                agent_id=agent_id,
-                amount=amount,
-                reason=reason
+        # Distribute rewards (single on-chain transaction when possible)
+        reason = f"Fitness event {event.event_id}: {fitness_score:.2f} fitness"
+        if niche:
+            reason += f" (niche: {niche})"
+        
+        if len(distribution) > 1:
+            self.credits_system.reward_agents_batch(
+                [(agent_id, amount, reason) for agent_id, amount in distribution.items()]
             )
-            
+        else:
+            for agent_id, amount in distribution.items():
+                self.credits_system.reward_agent(
+                    agent_id=agent_id,
+                    amount=amount,
+                    reason=reason
+                )
+        
+        for agent_id, amount in distribution.items():
             logger.info(f"💰 {agent_id}: {amount:.2f} D8C from {event.event_id}")
         
         logger.info(f"📊 Fitness event {event.event_id} distributed to {len(distribution)} agents")
         
         return event
     
+    def _update_agent_stats(self, event: FitnessEvent, distribution: Dict[str, float]):
+        """Fold one event into the running leaderboard stats"""
+        for contributor in event.contributors:
+            stats = self.agent_stats.get(contributor.agent_id)
+            if stats is None:
+                stats = self.agent_stats[contributor.agent_id] = {
+                    'earnings': 0.0,
+                    'contributions': 0,
+                    'contribution_score_total': 0.0
+                }
+            
+            stats['earnings'] += distribution.get(contributor.agent_id, 0.0)
+            stats['contributions'] += 1
+            stats['contribution_score_total'] += contributor.contribution_score
+    
     def get_agent_total_earnings(self, agent_id: str) -> float:
         """
         Calculate total earnings for an agent from fitness events
@@ -298,37 +337,22 @@ class RevenueAttributionSystem:
         Returns:
             List of (agent_id, value) tuples
         """
-        agents = {}
-        
-        for event in self.fitness_events:
-            distribution = event.get_contribution_distribution()
-            
-            for contributor in event.contributors:
-                agent_id = contributor.agent_id
-                
-                if agent_id not in agents:
-                    agents[agent_id] = {
-                        'earnings': 0.0,
-                        'contributions': 0,
-                        'contribution_scores': []
-                    }
-                
-                agents[agent_id]['earnings'] += distribution.get(agent_id, 0.0)
-                agents[agent_id]['contributions'] += 1
-                agents[agent_id]['contribution_scores'].append(contributor.contribution_score)
+        agents = self.agent_stats
         
         # Calculate metric
         if metric == 'earnings':
-            leaderboard = [(aid, data['earnings']) for aid, data in agents.items()]
+            leaderboard = ((aid, data['earnings']) for aid, data in agents.items())
         elif metric == 'contributions':
-            leaderboard = [(aid, data['contributions']) for aid, data in agents.items()]
+            leaderboard = ((aid, data['contributions']) for aid, data in agents.items())
         elif metric == 'average_contribution':
-            leaderboard = [
-                (aid, sum(data['contribution_scores']) / len(data['contribution_scores']))
+            leaderboard = (
+                (aid, data['contribution_score_total'] / data['contributions'])
                 for aid, data in agents.items()
-            ]
+            )
         else:
             raise ValueError(f"Unknown metric: {metric}")
         
-        leaderboard.sort(key=lambda x: x[1], reverse=True)
-        return leaderboard[:limit]
+        # Top-k selection over a lazy stream, same order as a full descending sort.
+        # nlargest already uses max() for k == 1 and otherwise keeps a k-sized
+        # heap in C, so a hand-rolled small-k insertion would only be slower.
+        return heapq.nlargest(limit, leaderboard, key=_BY_VALUE)
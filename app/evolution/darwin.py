@@ -9,13 +9,14 @@ from typing import List, Tuple, Optional, Any
 import random
 import json
 import logging
+import sys
 from dataclasses import dataclass
 import requests
 from datetime import datetime
 
 # Import economy system components
 try:
-    from app.economy.revenue_attribution import RevenueAttributionSystem
+    from app.economy.revenue_attribution import RevenueAttributionSystem, AgentContribution
     ECONOMY_AVAILABLE = True
 except ImportError:
     ECONOMY_AVAILABLE = False
@@ -35,6 +36,11 @@ class Genome:
     created_at: str = None
 
     def __post_init__(self):
+        # Elites, failed crossovers/mutations and reloaded populations carry
+        # identical prompts; interning makes them share one string object.
+        # Prompts parsed from LLM JSON may not be str: store those as-is
+        if type(self.prompt) is str:
+            self.prompt = sys.intern(self.prompt)
         if self.created_at is None:
             self.created_at = datetime.utcnow().isoformat()
         if self.parent_ids is None:
@@ -346,16 +352,29 @@ class EvolutionOrchestrator:
         
         try:
             # Calculate fitness for all agents
-            contributions = []
-            for agent in agents_data:
-                fitness = self.calculate_fitness_with_revenue(agent)
-                contributions.append((agent['agent_id'], fitness))
+            fitness_scores = [self.calculate_fitness_with_revenue(agent) for agent in agents_data]
+            best_fitness = max(fitness_scores, default=0.0)
+            now = datetime.now()
             
-            # Use attribution system to distribute
-            distribution = self.revenue_attribution.distribute_revenue(
-                total_revenue=total_revenue,
-                contributions=contributions
+            # Contribution scores are fitness relative to the best agent (0-1)
+            contributors = [
+                AgentContribution(
+                    agent_id=agent['agent_id'],
+                    role='generation_member',
+                    contribution_score=fitness / best_fitness if best_fitness > 0 else 0.0,
+                    actions_performed=agent.get('actions_performed', 0),
+                    timestamp=now
+                )
+                for agent, fitness in zip(agents_data, fitness_scores)
+            ]
+            
+            # Use attribution system to record and pay out the 40/40/20 split
+            event = self.revenue_attribution.record_fitness_event(
+                fitness_score=sum(fitness_scores),
+                revenue_generated=total_revenue,
+                contributors=contributors
             )
+            distribution = event.get_contribution_distribution()
             
             logger.info(f"💰 Revenue distributed: ${total_revenue:.2f} across {len(agents_data)} agents")
             
@@ -2,10 +2,13 @@
 Monitor en VIVO de la ejecución en el Raspberry Pi Slave
 Muestra stdout/stderr en tiempo real
 """
+import json
 import os
 import sys
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -15,35 +18,94 @@ SLAVE_IP = "192.168.4.38"
 SLAVE_PORT = 7600
 TOKEN = os.getenv('GITHUB_TOKEN')
 
-def execute_live(command: str, working_dir: str = None):
-    """Ejecuta comando y muestra output en tiempo real"""
-    url = f"http://{SLAVE_IP}:{SLAVE_PORT}/api/execute"
-    headers = {"Authorization": f"Bearer {TOKEN}"}
+# Una sola sesión: reutiliza la conexión (keep-alive) entre llamadas
+SESSION = requests.Session()
+SESSION.headers["Authorization"] = f"Bearer {TOKEN}"
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# $HOME del slave no cambia: se cachea por IP (SLAVE_HOME_REFRESH=1 lo renueva)
+HOME_CACHE = Path.home() / ".cache" / f"slave_home_{SLAVE_IP}"
+
+def _resolve_d8_dir() -> str:
+    """Devuelve el directorio d8 del slave, consultando $HOME solo si no está en caché"""
+    home_dir = ""
+    if HOME_CACHE.exists() and os.getenv("SLAVE_HOME_REFRESH") != "1":
+        home_dir = HOME_CACHE.read_text().strip()
     
-    payload = {"command": command}
-    if working_dir:
-        payload["working_dir"] = working_dir
+    if not home_dir:
+        home_dir = execute_live("echo $HOME")["stdout"].strip()
+        HOME_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        HOME_CACHE.write_text(home_dir)
     
+    return f"{home_dir}/d8"
+
+def _print_header(command: str, working_dir: str = None):
     print(f"\n🚀 Ejecutando: {command}")
     print(f"📂 En: {working_dir or 'directorio actual'}")
     print("=" * 80)
+
+def _run_command(command: str, working_dir: str = None):
+    """Envía el comando al slave; devuelve (result, error)"""
+    url = f"http://{SLAVE_IP}:{SLAVE_PORT}/api/execute"
+    
+    payload = {"command": command}
+    if working_dir:
+        payload["working_dir"] = working_dir
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=600)
-        result = response.json()
-        
-        if result.get("stdout"):
-            print(result["stdout"], end='')
-        
-        if result.get("stderr"):
-            print(result["stderr"], file=sys.stderr, end='')
+        response = SESSION.post(url, json=payload, timeout=600)
+        return response.json(), None
         
-        if result.get("success"):
-            print("\n✅ Comando completado exitosamente")
-        else:
-            print(f"\n❌ Error (exit code: {result.get('exit_code')})")
-        
-        return result
+    except requests.exceptions.Timeout:
+        return None, "\n⏱️  Timeout - el comando está tomando más de 10 minutos"
+    except Exception as e:
+        return None, f"\n❌ Error de comunicación: {e}"
+
+def _print_result(result, error):
+    if error:
+        print(error)
+        return None
+    
+    if result.get("stdout"):
+        print(result["stdout"], end='')
+    
+    if result.get("stderr"):
+        print(result["stderr"], file=sys.stderr, end='')
+    
+    if result.get("success"):
+        print("\n✅ Comando completado exitosamente")
+    else:
+        print(f"\n❌ Error (exit code: {result.get('exit_code')})")
+    
+    return result
+
+def execute_live(command: str, working_dir: str = None):
+    """Ejecuta comando y muestra output en tiempo real (NDJSON en streaming)"""
+    _print_header(command, working_dir)
+    
+    url = f"http://{SLAVE_IP}:{SLAVE_PORT}/api/execute"
+    payload = {"command": command, "stream": True}
+    if working_dir:
+        payload["working_dir"] = working_dir
+    
+    stdout = []
+    result = {}
+    try:
+        with SESSION.post(url, json=payload, stream=True, timeout=(5, 600)) as response:
+            for raw in response.iter_lines(decode_unicode=True):
+                if not raw:
+                    continue
+                message = json.loads(raw)
+                
+                if message.get("stream") == "stdout":
+                    stdout.append(message["line"])
+                    print(message["line"], end='', flush=True)
+                elif message.get("stream") == "stderr":
+                    print(message["line"], file=sys.stderr, end='', flush=True)
+                else:
+                    result = message
         
     except requests.exceptions.Timeout:
         print("\n⏱️  Timeout - el comando está tomando más de 10 minutos")
@@ -51,6 +113,26 @@ def execute_live(command: str, working_dir: str = None):
     except Exception as e:
         print(f"\n❌ Error de comunicación: {e}")
         return None
+    
+    result["stdout"] = "".join(stdout)
+    
+    if result.get("success"):
+        print("\n✅ Comando completado exitosamente")
+    else:
+        print(f"\n❌ Error (exit code: {result.get('exit_code')})")
+    
+    return result
+
+def execute_parallel(commands: list, working_dir: str = None):
+    """Ejecuta comandos independientes a la vez y muestra su output en orden"""
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        futures = [pool.submit(_run_command, command, working_dir) for command in commands]
+        
+        results = []
+        for command, future in zip(commands, futures):
+            _print_header(command, working_dir)
+            results.append(_print_result(*future.result()))
+        return results
 
 def main():
     print("=" * 80)
@@ -61,7 +143,7 @@ def main():
     # 1. Verificar conectividad
     print("\n1️⃣  Verificando conectividad...")
     try:
-        response = requests.get(f"http://{SLAVE_IP}:{SLAVE_PORT}/api/health", timeout=5)
+        response = SESSION.get(f"http://{SLAVE_IP}:{SLAVE_PORT}/api/health", timeout=5)
         if response.status_code == 200:
             print("✅ Slave online")
         else:
@@ -72,9 +154,7 @@ def main():
         return
     
     # 2. Crear venv
-    home_result = execute_live("echo $HOME")
-    home_dir = home_result["stdout"].strip()
-    d8_dir = f"{home_dir}/d8"
+    d8_dir = _resolve_d8_dir()
     
     print(f"\n2️⃣  Creando entorno virtual en {d8_dir}...")
     execute_live("rm -rf venv && python3 -m venv venv", working_dir=d8_dir)
@@ -83,17 +163,17 @@ def main():
     print("\n3️⃣  Instalando dependencias (esto puede tomar 2-3 minutos)...")
     execute_live("./venv/bin/pip install -r requirements.txt", working_dir=d8_dir)
     
-    # 4. Configurar .env
+    # 4. Configurar .env y 5. verificar que slave_server.py existe (independientes)
     print("\n4️⃣  Configurando .env...")
-    execute_live("""cat > .env << 'EOF'
+    print("5️⃣  Verificando archivos...")
+    execute_parallel([
+        """cat > .env << 'EOF'
 SLAVE_HOST=0.0.0.0
 SLAVE_PORT=7600
 LOG_LEVEL=INFO
-EOF""", working_dir=d8_dir)
-    
-    # 5. Verificar que slave_server.py existe
-    print("\n5️⃣  Verificando archivos...")
-    execute_live("ls -la app/distributed/slave_server.py", working_dir=d8_dir)
+EOF""",
+        "ls -la app/distributed/slave_server.py",
+    ], working_dir=d8_dir)
     
     # 6. Iniciar slave_server
     print("\n6️⃣  Iniciando slave_server en background...")
@@ -102,13 +182,13 @@ EOF""", working_dir=d8_dir)
     execute_live("nohup ./venv/bin/python app/distributed/slave_server.py > slave.log 2>&1 &", working_dir=d8_dir)
     time.sleep(2)
     
-    # 7. Verificar que está corriendo
+    # 7. Verificar que está corriendo y 8. ver últimas líneas del log (independientes)
     print("\n7️⃣  Verificando proceso...")
-    execute_live("pgrep -f slave_server.py && echo 'Proceso encontrado' || echo 'Proceso NO encontrado'", working_dir=d8_dir)
-    
-    # 8. Ver últimas líneas del log
-    print("\n8️⃣  Últimas líneas del log:")
-    execute_live("tail -n 20 slave.log", working_dir=d8_dir)
+    print("8️⃣  Últimas líneas del log:")
+    execute_parallel([
+        "pgrep -f slave_server.py && echo 'Proceso encontrado' || echo 'Proceso NO encontrado'",
+        "tail -n 20 slave.log",
+    ], working_dir=d8_dir)
     
     print("\n" + "=" * 80)
     print("✅ INSTALACIÓN COMPLETADA")
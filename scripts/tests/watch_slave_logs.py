@@ -2,8 +2,9 @@
 Ver logs del slave_server.py en tiempo real (tail -f)
 """
 import os
-import time
 import requests
+from requests.adapters import HTTPAdapter
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,56 +13,53 @@ SLAVE_IP = "192.168.4.38"
 SLAVE_PORT = 7600
 TOKEN = os.getenv('GITHUB_TOKEN')
 
-def tail_logs():
-    """Simula tail -f del slave.log"""
-    url = f"http://{SLAVE_IP}:{SLAVE_PORT}/api/execute"
-    headers = {"Authorization": f"Bearer {TOKEN}"}
+# Una sola sesión: reutiliza la conexión (keep-alive) entre llamadas
+SESSION = requests.Session()
+SESSION.headers["Authorization"] = f"Bearer {TOKEN}"
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# $HOME del slave no cambia: se cachea por IP (SLAVE_HOME_REFRESH=1 lo renueva)
+HOME_CACHE = Path.home() / ".cache" / f"slave_home_{SLAVE_IP}"
+
+def _resolve_d8_dir() -> str:
+    """Devuelve el directorio d8 del slave, consultando $HOME solo si no está en caché"""
+    home_dir = ""
+    if HOME_CACHE.exists() and os.getenv("SLAVE_HOME_REFRESH") != "1":
+        home_dir = HOME_CACHE.read_text().strip()
     
-    # Obtener home dir
-    response = requests.post(url, json={"command": "echo $HOME"}, headers=headers)
-    home_dir = response.json()["stdout"].strip()
-    d8_dir = f"{home_dir}/d8"
+    if not home_dir:
+        response = SESSION.post(
+            f"http://{SLAVE_IP}:{SLAVE_PORT}/api/execute",
+            json={"command": "echo $HOME"}
+        )
+        home_dir = response.json()["stdout"].strip()
+        HOME_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        HOME_CACHE.write_text(home_dir)
+    
+    return f"{home_dir}/d8"
+
+def tail_logs():
+    """tail -f del slave.log vía streaming desde el slave"""
+    d8_dir = _resolve_d8_dir()
     
     print(f"📡 Monitoreando logs de {SLAVE_IP}:{SLAVE_PORT}")
     print(f"📂 Archivo: {d8_dir}/slave.log")
     print("=" * 80)
     print("Presiona Ctrl+C para salir\n")
     
-    last_lines = 0
-    
+    # Un solo GET en streaming: el slave envía cada línea nueva de slave.log
     try:
-        while True:
-            # Contar líneas
-            response = requests.post(
-                url, 
-                json={"command": "wc -l < slave.log", "working_dir": d8_dir}, 
-                headers=headers,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    current_lines = int(result["stdout"].strip())
-                    
-                    if current_lines > last_lines:
-                        # Hay líneas nuevas, mostrarlas
-                        new_lines = current_lines - last_lines
-                        response = requests.post(
-                            url,
-                            json={"command": f"tail -n {new_lines} slave.log", "working_dir": d8_dir},
-                            headers=headers,
-                            timeout=5
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            if result.get("stdout"):
-                                print(result["stdout"], end='')
-                        
-                        last_lines = current_lines
-            
-            time.sleep(1)
+        with SESSION.get(
+            f"http://{SLAVE_IP}:{SLAVE_PORT}/api/tail",
+            params={"path": f"{d8_dir}/slave.log"},
+            stream=True,
+            timeout=(5, None)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                print(line)
             
     except KeyboardInterrupt:
         print("\n\n✅ Monitoreo detenido")
@@ -13,6 +13,7 @@ Fixtures disponibles:
 - fresh_blockchain: Blockchain limpio
 - three_agents: 3 agentes pre-registrados
 - sample_contributions: Contribuciones de ejemplo
+- fitness_event / fitness_event_solo / fitness_event_trio: Eventos pre-registrados
 - funded_agent: Agente con balance inicial
 
 Uso:
@@ -24,21 +25,82 @@ Autor: D8 System
 Fecha: 2025-11-20
 """
 
+import copy
 import pytest
+from datetime import datetime
+from types import MappingProxyType
+from app.economy.revenue_attribution import AgentContribution
+from app.economy.accounting import ExpenseCategory
 from app.economy.mock_blockchain import (
     create_mock_economy_system,
     MockBSCClient,
     MockD8TokenClient,
     MockBlockchain
 )
+from app.economy.mock_security import MockFundamentalLawsSecurity
+
+
+# Campos obligatorios de una transacción (ver transaction_validator)
+REQUIRED_TX_FIELDS = frozenset({'hash', 'from', 'to', 'amount', 'timestamp', 'status'})
+
+
+# Módulos de app.economy cuyo datetime.now() se congela en cada test
+_CLOCK_MODULES = (
+    "app.economy",
+    "app.economy.accounting",
+    "app.economy.d8_credits",
+    "app.economy.mock_blockchain",
+    "app.economy.revenue_attribution",
+)
+
+
+class FrozenDatetime(datetime):
+    """datetime cuyo now() devuelve siempre el instante fijado en frozen_clock"""
+    frozen_now = None
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls.frozen_now
+
+
+# ============================================================
+# FIXTURES DE TIEMPO
+# ============================================================
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    """
+    Fixture: Congela datetime.now() del sistema económico durante el test
+    
+    Los mocks no necesitan la hora real; con un instante fijo los
+    timestamps son deterministas y no se consulta el reloj en cada
+    transacción.
+    
+    Returns:
+        datetime: Instante devuelto por datetime.now() en app.economy
+    """
+    FrozenDatetime.frozen_now = FrozenDatetime.fromtimestamp(datetime.now().timestamp())
+    for module in _CLOCK_MODULES:
+        monkeypatch.setattr(f"{module}.datetime", FrozenDatetime)
+    return FrozenDatetime.frozen_now
 
 
 # ============================================================
 # FIXTURES PRINCIPALES
 # ============================================================
 
+@pytest.fixture(scope="module")
+def mock_economy_module():
+    """
+    Fixture: Sistema económico mock construido una sola vez por módulo
+    
+    No usar directamente: mock_economy lo restaura después de cada test.
+    """
+    return create_mock_economy_system(blockchain=MockBlockchain())
+
+
 @pytest.fixture
-def mock_economy():
+def mock_economy(mock_economy_module):
     """
     Fixture: Sistema económico mock completo
     
@@ -57,8 +119,41 @@ def mock_economy():
             wallet = mock_economy.credits.create_wallet("agent")
             balance = mock_economy.credits.get_balance(wallet)
             assert balance == 0.0
+    
+    El sistema se construye una vez por módulo (mock_economy_module); aquí
+    se guarda una copia de su estado al empezar el test y se restaura al
+    terminar, así cada test lo ve igual que recién creado.
     """
-    return create_mock_economy_system()
+    economy = mock_economy_module
+    components = (economy.bsc, economy.token, economy.credits, economy.attribution, economy.accounting)
+    
+    # Los componentes se referencian entre sí: el memo evita copiarlos
+    memo = {id(component): component for component in components}
+    snapshot = copy.deepcopy([component.__dict__ for component in components], memo)
+    
+    yield economy
+    
+    for component, state in zip(components, snapshot):
+        component.__dict__.clear()
+        component.__dict__.update(state)
+
+
+@pytest.fixture(autouse=True)
+def monthly_budget(request):
+    """
+    Fixture: Inicializa el presupuesto mensual en tests marcados needs_budget
+    
+    Solo actúa si el test tiene @pytest.mark.needs_budget; el resto no
+    paga el coste de poblar el presupuesto.
+    
+    Ejemplo:
+        @pytest.mark.needs_budget
+        def test_budget(mock_economy):
+            assert mock_economy.accounting.budgets
+    """
+    if request.node.get_closest_marker("needs_budget") is None:
+        return
+    request.getfixturevalue("mock_economy").accounting.initialize_monthly_budget()
 
 
 @pytest.fixture
@@ -75,17 +170,39 @@ def fresh_blockchain():
         def test_first_transaction(fresh_blockchain):
             assert len(fresh_blockchain.transactions) == 0
     """
-    blockchain = MockBlockchain()
-    blockchain.transactions = []
-    blockchain.balances = {}
-    return blockchain
+    return MockBlockchain()
+
+
+@pytest.fixture(scope="module")
+def bsc_client_module():
+    """
+    Fixture: Cliente BSC mock compartido por todo el módulo
+    
+    Usar mock_bsc_client en los tests: reinicia el estado del
+    blockchain al terminar cada test.
+    """
+    return MockBSCClient()
+
+
+@pytest.fixture(scope="module")
+def token_client_module(bsc_client_module):
+    """
+    Fixture: Cliente D8Token mock compartido por todo el módulo
+    
+    Usar mock_token_client en los tests: olvida los agentes
+    registrados al terminar cada test.
+    """
+    return MockD8TokenClient(bsc_client_module, "0xMOCKTOKEN")
 
 
 @pytest.fixture
-def mock_bsc_client():
+def mock_bsc_client(bsc_client_module):
     """
     Fixture: Cliente BSC mock
     
+    Reutiliza el cliente del módulo y le da un blockchain limpio
+    al terminar el test.
+    
     Returns:
         MockBSCClient: Cliente para crear cuentas y enviar transacciones
         
@@ -94,11 +211,12 @@ def mock_bsc_client():
             account = mock_bsc_client.create_account()
             assert account['address'].startswith('0x')
     """
-    return MockBSCClient()
+    yield bsc_client_module
+    bsc_client_module.reset()
 
 
 @pytest.fixture
-def mock_token_client(mock_bsc_client):
+def mock_token_client(token_client_module, mock_bsc_client):
     """
     Fixture: Cliente D8Token mock
     
@@ -109,11 +227,33 @@ def mock_token_client(mock_bsc_client):
         MockD8TokenClient: Cliente para operaciones con D8Token
         
     Ejemplo:
-        def test_token_transfer(mock_token_client):
-            agent = mock_token_client.bsc_client.create_account()['address']
-            mock_token_client.register_agent(agent, "test_agent")
+        def test_token_transfer(mock_bsc_client, mock_token_client):
+            congress = mock_bsc_client.create_account()
+            agent = mock_bsc_client.create_account()['address']
+            mock_token_client.register_agent(
+                congress['address'], congress['private_key'], agent, "test_agent"
+            )
+    """
+    yield token_client_module
+    token_client_module.reset()
+
+
+@pytest.fixture(scope="module")
+def laws_security_module():
+    """Fixture: MockFundamentalLawsSecurity compartido por todo el módulo"""
+    return MockFundamentalLawsSecurity()
+
+
+@pytest.fixture
+def mock_laws_security(laws_security_module):
     """
-    return MockD8TokenClient(mock_bsc_client, "0xMOCKTOKEN")
+    Fixture: Seguridad de leyes mock sin leyes desplegadas
+    
+    Returns:
+        MockFundamentalLawsSecurity: Limpio al empezar cada test
+    """
+    yield laws_security_module
+    laws_security_module.reset()
 
 
 # ============================================================
@@ -134,21 +274,16 @@ def three_agents(mock_economy):
         mock_economy: Sistema económico mock
     
     Returns:
-        dict: {"researcher": "0x...", "optimizer": "0x...", "validator": "0x..."}
+        dict: {"researcher": AgentWallet, "optimizer": AgentWallet, "validator": AgentWallet}
         
     Ejemplo:
         def test_distribution(mock_economy, three_agents):
-            researcher_id = three_agents["researcher"]
+            researcher_id = three_agents["researcher"].agent_id
             balance = mock_economy.credits.get_balance(researcher_id)
     """
-    agents = {}
     roles = ["researcher", "optimizer", "validator"]
-    
-    for role in roles:
-        agent_id = mock_economy.credits.create_wallet(role)
-        agents[role] = agent_id
-    
-    return agents
+    wallets = mock_economy.credits.create_wallets_bulk(roles)
+    return dict(zip(roles, wallets))
 
 
 @pytest.fixture
@@ -209,70 +344,121 @@ def agent_pair(mock_economy):
 # ============================================================
 
 @pytest.fixture
-def sample_contributions(three_agents):
+def standard_contributions():
+    """
+    Fixture: Contribuciones estándar researcher/optimizer/validator
+    
+    Devuelve una tupla de contribuciones nuevas en cada test; los
+    agent_id coinciden con los roles de three_agents.
+    
+    Returns:
+        tuple: AgentContribution de researcher (0.95), optimizer (0.60)
+        y validator (0.30)
+    """
+    now = datetime.now()
+    return tuple(
+        AgentContribution(
+            agent_id=role,
+            role=role,
+            contribution_score=score,
+            actions_performed=actions,
+            timestamp=now
+        )
+        for role, score, actions in (
+            ("researcher", 0.95, 10),
+            ("optimizer", 0.60, 5),
+            ("validator", 0.30, 2),
+        )
+    )
+
+
+@pytest.fixture
+def sample_contributions(three_agents, standard_contributions):
     """
     Fixture: Lista de contribuciones de ejemplo para tests de attribution
     
     Args:
         three_agents: Dict con 3 agentes registrados
+        standard_contributions: Contribuciones estándar del test
     
     Returns:
-        list: Contribuciones con scores y action counts
+        list: AgentContribution de researcher, optimizer y validator
         
     Ejemplo:
         def test_distribution(mock_economy, sample_contributions):
             event = mock_economy.attribution.record_fitness_event(
-                event_type="test",
                 fitness_score=90.0,
-                niche="test_niche",
-                contributions=sample_contributions
+                revenue_generated=100.0,
+                contributors=sample_contributions,
+                niche="test_niche"
             )
     """
-    return [
-        {
-            "agent_id": three_agents["researcher"],
-            "contribution_score": 0.95,
-            "actions_count": 10
-        },
-        {
-            "agent_id": three_agents["optimizer"],
-            "contribution_score": 0.60,
-            "actions_count": 5
-        },
-        {
-            "agent_id": three_agents["validator"],
-            "contribution_score": 0.30,
-            "actions_count": 2
-        }
-    ]
+    return list(standard_contributions)
 
 
 @pytest.fixture
-def fitness_event(mock_economy, sample_contributions):
+def fitness_event_solo(mock_economy):
     """
-    Fixture: Fitness event pre-registrado
+    Fixture: Fitness event con un único contribuyente
     
-    Args:
-        mock_economy: Sistema económico mock
-        sample_contributions: Contribuciones de ejemplo
+    Solo crea una wallet; no construye los 3 agentes ni sus
+    contribuciones.
     
     Returns:
-        dict: Fitness event con event_id y metadata
-        
-    Ejemplo:
-        def test_revenue_distribution(mock_economy, fitness_event):
-            distribution = mock_economy.attribution.distribute_revenue(
-                event_id=fitness_event['event_id'],
-                revenue_amount=100.0
+        FitnessEvent: Evento registrado (100 D8C al único agente)
+    """
+    wallet = mock_economy.credits.create_wallet("solo_agent")
+    return mock_economy.attribution.record_fitness_event(
+        fitness_score=85.0,
+        revenue_generated=100.0,
+        contributors=[
+            AgentContribution(
+                agent_id=wallet.agent_id,
+                role="researcher",
+                contribution_score=1.0,
+                actions_performed=1,
+                timestamp=datetime.now()
             )
+        ],
+        niche="twitter_threads"
+    )
+
+
+@pytest.fixture
+def fitness_event_trio(mock_economy, sample_contributions):
     """
-    event = mock_economy.attribution.record_fitness_event(
-        event_type="twitter_thread",
+    Fixture: Fitness event con 3 contribuyentes (regla 40/40/20)
+    
+    Returns:
+        FitnessEvent: Evento registrado con sample_contributions
+    """
+    return mock_economy.attribution.record_fitness_event(
         fitness_score=85.0,
-        niche="twitter_threads",
-        contributions=sample_contributions
+        revenue_generated=100.0,
+        contributors=sample_contributions,
+        niche="twitter_threads"
     )
-    return event
+
+
+@pytest.fixture
+def fitness_event(fitness_event_trio):
+    """
+    Fixture: Fitness event pre-registrado (alias de fitness_event_trio)
+    
+    Para tests que sirven con cualquier evento, parametrizar por nombre
+    de fixture y resolverla con request.getfixturevalue, así solo se
+    construye la cadena de fixtures que cada caso necesita.
+    
+    Returns:
+        FitnessEvent: Evento con event_id y metadata
+        
+    Ejemplo:
+        @pytest.mark.parametrize("event_fixture", ["fitness_event_solo", "fitness_event_trio"])
+        def test_event(request, event_fixture):
+            event = request.getfixturevalue(event_fixture)
+            assert event.event_id.startswith("FIT")
+    """
+    return fitness_event_trio
 
 
 @pytest.fixture
@@ -284,52 +470,46 @@ def sample_expenses(mock_economy):
         mock_economy: Sistema económico mock
     
     Returns:
-        list: IDs de expenses registrados
+        list: Expense registrados (sin pagar), en orden
         
     Ejemplo:
         def test_financial_report(mock_economy, sample_expenses):
-            report = mock_economy.accounting.get_financial_report()
+            report = mock_economy.accounting.generate_financial_report()
             assert len(report['expenses_by_category']) > 0
     """
-    expenses = []
-    
     expense_data = [
-        ("api_costs", 50.0, "Groq API: 1000 requests"),
-        ("api_costs", 30.0, "Gemini API: 500 requests"),
-        ("infrastructure", 20.0, "Server hosting"),
-        ("research", 15.0, "Model evaluation")
+        {"category": ExpenseCategory.API_COSTS, "amount": 50.0, "description": "Groq API: 1000 requests", "auto_pay": False},
+        {"category": ExpenseCategory.API_COSTS, "amount": 30.0, "description": "Gemini API: 500 requests", "auto_pay": False},
+        {"category": ExpenseCategory.INFRASTRUCTURE, "amount": 20.0, "description": "Server hosting", "auto_pay": False},
+        {"category": ExpenseCategory.RESEARCH, "amount": 15.0, "description": "Model evaluation", "auto_pay": False}
     ]
     
-    for category, amount, description in expense_data:
-        expense_id = mock_economy.accounting.record_expense(
-            category=category,
-            amount=amount,
-            description=description
-        )
-        expenses.append(expense_id)
-    
-    return expenses
+    return mock_economy.accounting.record_expenses_batch(expense_data)
 
 
 # ============================================================
 # FIXTURES DE CONFIGURACIÓN
 # ============================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config():
     """
-    Fixture: Configuración mock para tests
+    Fixture: Configuración mock para tests (solo lectura)
+    
+    Se construye una vez por sesión y se comparte entre tests, por eso
+    se devuelve como MappingProxyType. Para modificarla usar
+    mock_config_mut.
     
     Returns:
-        dict: Configuración de sistema mock
+        MappingProxyType: Configuración de sistema mock
         
     Ejemplo:
         def test_with_config(mock_config):
             assert mock_config['initial_congress_balance'] == 10000.0
     """
-    return {
+    return MappingProxyType({
         "initial_congress_balance": 10000.0,
-        "monthly_budget": {
+        "monthly_budget": MappingProxyType({
             "api_costs": 500.0,
             "infrastructure": 200.0,
             "blockchain": 150.0,
@@ -337,9 +517,23 @@ def mock_config():
             "research": 150.0,
             "development": 75.0,
             "emergency": 25.0
-        },
+        }),
         "attribution_rule": "40_40_20",
         "revenue_mode": "revenue_to_leo"
+    })
+
+
+@pytest.fixture
+def mock_config_mut(mock_config):
+    """
+    Fixture: Copia modificable de mock_config (una por test)
+    
+    Returns:
+        dict: Configuración mock, incluido monthly_budget como dict
+    """
+    return {
+        key: dict(value) if isinstance(value, MappingProxyType) else value
+        for key, value in mock_config.items()
     }
 
 
@@ -362,8 +556,7 @@ def transaction_validator():
     """
     def validate(tx):
         """Valida que una transacción tenga estructura correcta"""
-        required_fields = ['hash', 'from', 'to', 'amount', 'timestamp', 'status']
-        return all(field in tx for field in required_fields)
+        return REQUIRED_TX_FIELDS <= tx.keys()
     
     return validate
 
@@ -384,6 +577,8 @@ def balance_checker(mock_economy):
             balances = balance_checker(three_agents.values())
             assert all(b >= 0 for b in balances.values())
     """
+    get_balance = mock_economy.credits.get_balance
+    
     def check_balances(agent_ids):
         """
         Retorna dict con balances de múltiples agentes
@@ -394,10 +589,7 @@ def balance_checker(mock_economy):
         Returns:
             dict: {agent_id: balance}
         """
-        return {
-            agent_id: mock_economy.credits.get_balance(agent_id)
-            for agent_id in agent_ids
-        }
+        return {agent_id: get_balance(agent_id) for agent_id in agent_ids}
     
     return check_balances
 
@@ -428,6 +620,18 @@ def pytest_configure(config):
         "markers", 
         "integration: Tests de integración entre múltiples componentes"
     )
+    config.addinivalue_line(
+        "markers", 
+        "needs_budget: Tests que requieren el presupuesto mensual inicializado"
+    )
+
+
+# Módulo de test → nombre del marker aplicado automáticamente (se guardan
+# como texto: al importar el conftest los markers aún no están registrados)
+_MODULE_MARKERS = (
+    ("test_mock_economy.py", "mock"),
+    ("test_economy_system.py", "real"),
+)
 
 
 def pytest_collection_modifyitems(config, items):
@@ -439,10 +643,11 @@ def pytest_collection_modifyitems(config, items):
     - test_economy_system.py → marca como 'real'
     """
     for item in items:
-        if "test_mock_economy" in item.nodeid:
-            item.add_marker(pytest.mark.mock)
-        elif "test_economy_system" in item.nodeid:
-            item.add_marker(pytest.mark.real)
+        module = item.nodeid.split("::", 1)[0]
+        for suffix, marker_name in _MODULE_MARKERS:
+            if module.endswith(suffix):
+                item.add_marker(marker_name)
+                break
 
 
 # ============================================================
@@ -453,12 +658,18 @@ def pytest_collection_modifyitems(config, items):
 GUÍA DE USO DE FIXTURES
 ========================
 
+Fixtures Automáticas:
+---------------------
+frozen_clock:           datetime.now() congelado en app.economy (autouse)
+monthly_budget:         Presupuesto mensual para tests needs_budget (autouse)
+
 Fixtures Básicas:
 -----------------
-mock_economy:           Sistema económico completo
+mock_economy:           Sistema económico completo (compartido por módulo, restaurado por test)
 fresh_blockchain:       Blockchain limpio
-mock_bsc_client:        Cliente BSC para transacciones
-mock_token_client:      Cliente D8Token
+mock_bsc_client:        Cliente BSC para transacciones (compartido por módulo, reiniciado por test)
+mock_token_client:      Cliente D8Token (compartido por módulo, reiniciado por test)
+mock_laws_security:     Seguridad de leyes mock (compartida por módulo, reiniciada por test)
 
 Fixtures de Agentes:
 --------------------
@@ -468,10 +679,18 @@ agent_pair:             2 agentes (sender con 500 D8C, receiver con 0)
 
 Fixtures de Datos:
 ------------------
+standard_contributions: Plantilla de contribuciones (tupla, scope module)
 sample_contributions:   Contribuciones de ejemplo
-fitness_event:          Fitness event pre-registrado
+fitness_event:          Fitness event pre-registrado (3 agentes)
+fitness_event_solo:     Fitness event con 1 agente
+fitness_event_trio:     Fitness event con 3 agentes
 sample_expenses:        Gastos registrados
 
+Fixtures de Configuración:
+--------------------------
+mock_config:            Configuración compartida (solo lectura, scope session)
+mock_config_mut:        Copia modificable de mock_config
+
 Fixtures de Utilidades:
 -----------------------
 transaction_validator:  Validador de estructura de TX
@@ -483,6 +702,7 @@ Markers Disponibles:
 @pytest.mark.real:          Test requiere blockchain real
 @pytest.mark.slow:          Test toma >5 segundos
 @pytest.mark.integration:   Test de integración
+@pytest.mark.needs_budget:  Inicializa el presupuesto mensual antes del test
 
 Ejemplos:
 ---------
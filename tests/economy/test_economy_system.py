@@ -146,9 +146,6 @@ class TestAutonomousAccounting:
     
     def test_expense_recording(self, mock_economy):
         """Test recording an expense"""
-        # Initialize budget
-        mock_economy.accounting.initialize_monthly_budget()
-        
         expense = mock_economy.accounting.record_expense(
             category=ExpenseCategory.API_COSTS,
             amount=50.0,
@@ -160,26 +157,23 @@ class TestAutonomousAccounting:
         assert expense.amount == 50.0
         assert expense.paid == False
     
+    @pytest.mark.needs_budget
     def test_budget_exceeded_warning(self, mock_economy):
         """Test warning when budget exceeded"""
-        mock_economy.accounting.initialize_monthly_budget()
-        
         # Exceed API costs budget (default: 500)
-        for i in range(11):
-            mock_economy.accounting.record_expense(
-                category=ExpenseCategory.API_COSTS,
-                amount=50.0,
-                description=f"API call {i}",
-                auto_pay=False
-            )
+        mock_economy.accounting.record_expenses_bulk(
+            category=ExpenseCategory.API_COSTS,
+            amounts=[50.0] * 11,
+            descriptions=[f"API call {i}" for i in range(11)],
+            auto_pay=False
+        )
         
         # Check alerts
         assert len(mock_economy.accounting.alerts_sent) > 0
     
+    @pytest.mark.needs_budget
     def test_financial_report(self, mock_economy):
         """Test financial report generation"""
-        mock_economy.accounting.initialize_monthly_budget()
-        
         # Record some expenses
         mock_economy.pay_api_cost(100.0, "Groq", "Test usage")
         mock_economy.pay_api_cost(50.0, "Gemini", "Test usage")
@@ -255,6 +249,19 @@ class TestIntegratedSystem:
 
 # Fixtures
 
+class _TokenStub:
+    """
+    Plain D8Token client stub
+    
+    These methods are called many times per test and no test inspects
+    their calls, so MagicMock call recording is pure overhead here.
+    """
+    get_balance = staticmethod(lambda *args, **kwargs: 0.0)
+    register_agent = staticmethod(lambda *args, **kwargs: '0x' + 'e' * 64)
+    transfer = staticmethod(lambda *args, **kwargs: '0x' + 'a' * 64)
+    distribute_reward = staticmethod(lambda *args, **kwargs: '0x' + 'b' * 64)
+
+
 @pytest.fixture
 def mock_economy():
     """
@@ -272,10 +279,7 @@ def mock_economy():
     }
     bsc_mock.wait_for_receipt.return_value = {'status': 1, 'blockNumber': 12345}
     
-    token_mock = MagicMock()
-    token_mock.get_balance.return_value = 0.0
-    token_mock.transfer.return_value = '0x' + 'a' * 64
-    token_mock.distribute_reward.return_value = '0x' + 'b' * 64
+    token_mock = _TokenStub()
     
     # Create economy with mocks
     from app.economy.d8_credits import D8CreditsSystem
@@ -302,6 +306,7 @@ def mock_economy():
         'created_at': datetime.now().isoformat()
     }
     
+    now = datetime.now
     economy.record_agent_contribution = lambda **kwargs: attribution.record_fitness_event(
         fitness_score=kwargs['fitness_score'],
         revenue_generated=kwargs['revenue_generated'],
@@ -310,7 +315,7 @@ def mock_economy():
             role=kwargs['role'],
             contribution_score=kwargs.get('contribution_score', 1.0),
             actions_performed=kwargs.get('actions_performed', 1),
-            timestamp=datetime.now()
+            timestamp=now()
         )],
         niche=kwargs.get('niche')
     )
@@ -326,27 +331,36 @@ def mock_economy():
         'contributions': attribution.get_agent_contribution_stats(agent_id)
     }
     
-    economy.get_system_health = lambda: {
-        'status': 'HEALTHY',
-        'congress_balance': credits.get_balance('congress'),
-        'total_agents': len(credits.wallets),
-        'total_supply': credits.get_total_supply(),
-        'total_fitness': attribution.get_collective_fitness()['total_fitness'],
-        'total_revenue': attribution.get_collective_fitness()['total_revenue'],
-        'unpaid_expenses': 0,
-        'active_alerts': 0,
-        'timestamp': datetime.now().isoformat()
-    }
+    def get_system_health(collective_fitness=None):
+        if collective_fitness is None:
+            collective_fitness = attribution.get_collective_fitness()
+        return {
+            'status': 'HEALTHY',
+            'congress_balance': credits.get_balance('congress'),
+            'total_agents': len(credits.wallets),
+            'total_supply': credits.get_total_supply(),
+            'total_fitness': collective_fitness['total_fitness'],
+            'total_revenue': collective_fitness['total_revenue'],
+            'unpaid_expenses': 0,
+            'active_alerts': 0,
+            'timestamp': datetime.now().isoformat()
+        }
     
-    economy.generate_full_report = lambda: {
-        'system_health': economy.get_system_health(),
-        'financial_report': accounting.generate_financial_report(),
-        'credits_stats': credits.get_stats(),
-        'collective_fitness': attribution.get_collective_fitness(),
-        'top_earners': attribution.get_leaderboard('earnings', 10),
-        'top_contributors': attribution.get_leaderboard('contributions', 10),
-        'richest_agents': credits.get_richest_agents(10)
-    }
+    def generate_full_report():
+        financial_report = accounting.generate_financial_report()
+        collective_fitness = financial_report['collective_fitness']
+        return {
+            'system_health': get_system_health(collective_fitness),
+            'financial_report': financial_report,
+            'credits_stats': credits.get_stats(),
+            'collective_fitness': collective_fitness,
+            'top_earners': attribution.get_leaderboard('earnings', 10),
+            'top_contributors': attribution.get_leaderboard('contributions', 10),
+            'richest_agents': credits.get_richest_agents(10)
+        }
+    
+    economy.get_system_health = get_system_health
+    economy.generate_full_report = generate_full_report
     
     return economy
 
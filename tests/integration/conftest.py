@@ -0,0 +1,63 @@
+"""
+Pytest Configuration & Fixtures - D8 Integration Tests
+======================================================
+
+Fixtures compartidas por los tests de integración.
+
+Fixtures disponibles:
+- fake_llm: LLM manager falso (sin red) para inyectar en BaseAgent
+
+Uso:
+    def test_example(fake_llm):
+        agent = BaseAgent(genome=genome, llm_manager=fake_llm)
+        agent.act({"task": "work"})  # No llama a Groq
+"""
+
+import pytest
+
+
+class FakeLLMManager:
+    """
+    Sustituto de LLMFallbackManager que responde sin salir a la red
+    
+    Devuelve siempre la misma respuesta JSON y cuenta las llamadas, de modo
+    que el camino económico (coste de tokens, gastos, revenue) se ejecuta
+    igual que con un proveedor real.
+    """
+    
+    provider = "fake"
+    tokens_used = 42
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def chat(self, messages, **kwargs):
+        self.calls += 1
+        content = {
+            "action": "ok",
+            "reasoning": "fake LLM response",
+            "parameters": {},
+            "expected_outcome": "ok",
+            "confidence": 1.0,
+            "success": True
+        }
+        return {"content": content, "tokens_used": self.tokens_used}, self.provider
+
+
+@pytest.fixture
+def fake_llm():
+    """
+    Fixture: LLM manager falso para BaseAgent(llm_manager=...)
+    
+    Evita el round-trip a Groq (200-2000 ms por llamada) en tests que
+    solo necesitan ejercitar el flujo económico del agente.
+    """
+    return FakeLLMManager()
+
+
+def pytest_configure(config):
+    """Registra los markers custom de los tests de integración"""
+    config.addinivalue_line(
+        "markers",
+        "integration_live: Tests que llaman a proveedores LLM reales (requieren GROQ_API_KEY)"
+    )
@@ -6,14 +6,15 @@ Tests the complete flow: Agent → Action → Cost → Revenue → Fitness → D
 import pytest
 import os
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from app.economy.d8_credits import D8CreditsSystem
-from app.economy.accounting import AutonomousAccountingSystem
-from app.economy.revenue_attribution import RevenueAttributionSystem
+from app.economy.mock_blockchain import create_mock_economy_system, MockBlockchain
+from app.economy.accounting import ExpenseCategory
+from app.economy.revenue_attribution import AgentContribution
 from app.agents.base_agent import BaseAgent
 from app.evolution.darwin import Genome, DeepSeekEvolutionEngine, EvolutionOrchestrator
 
@@ -27,25 +28,44 @@ def groq_api_key():
     return api_key
 
 
-@pytest.fixture
-def credits_system():
-    """Initialize D8 Credits System"""
-    return D8CreditsSystem()
+@pytest.fixture(scope="module")
+def mock_economy():
+    """Mock economy (blockchain, token, credits, attribution, accounting), once per module"""
+    return create_mock_economy_system(blockchain=MockBlockchain())
 
 
-@pytest.fixture
-def accounting_system():
-    """Initialize Autonomous Accounting"""
-    system = AutonomousAccountingSystem()
-    system.set_monthly_budget("api_calls", 100.0)
-    system.set_monthly_budget("infrastructure", 50.0)
-    return system
+@pytest.fixture(scope="module")
+def credits_system(mock_economy):
+    """D8 Credits System backed by the mock blockchain"""
+    return mock_economy.credits
 
 
-@pytest.fixture
-def revenue_attribution():
-    """Initialize Revenue Attribution"""
-    return RevenueAttributionSystem()
+@pytest.fixture(scope="module")
+def accounting_system(mock_economy):
+    """Autonomous Accounting with the default monthly budget"""
+    return mock_economy.accounting
+
+
+@pytest.fixture(scope="module")
+def revenue_attribution(mock_economy):
+    """Revenue Attribution paying out through credits_system"""
+    return mock_economy.attribution
+
+
+@pytest.fixture(autouse=True)
+def _reset_state(credits_system, accounting_system, revenue_attribution):
+    """
+    Give every test empty economy state without rebuilding the systems
+    
+    Expenses are auto-paid from the "congress" wallet, so it is created
+    and funded before each test.
+    """
+    credits_system.create_wallet("congress")
+    credits_system.reward_agent("congress", 1000.0, "Expense fund")
+    yield
+    credits_system.reset()
+    accounting_system.reset()
+    revenue_attribution.reset()
 
 
 @pytest.fixture
@@ -73,6 +93,7 @@ class TestAgentEconomyIntegration:
         assert test_agent.wallet is not None
         assert test_agent.agent_id in credits_system.wallets
         
+    @pytest.mark.integration_live
     def test_agent_records_api_cost(self, test_agent, accounting_system):
         """Agent should record API costs when acting"""
         initial_expenses = len(accounting_system.expenses)
@@ -86,7 +107,7 @@ class TestAgentEconomyIntegration:
         assert result['success'] == True
         
         # Check expense recorded
-        api_expenses = [e for e in accounting_system.expenses if e.category == "api_calls"]
+        api_expenses = accounting_system.get_expenses(ExpenseCategory.API_COSTS)
         assert len(api_expenses) > 0
         
     def test_agent_records_revenue(self, test_agent, credits_system):
@@ -138,6 +159,15 @@ class TestEvolutionEconomyIntegration:
         
         assert abs(fitness - expected) < 0.01
         
+    def test_genome_prompt_interning(self):
+        """Equal prompts should share storage; non-str prompts are kept as-is"""
+        a = Genome(prompt="".join(["You are ", "agent 0"]))
+        b = Genome(prompt="".join(["You are ", "agent 0"]))
+        assert a.prompt is b.prompt
+        
+        parsed = {"prompt": "unparsed LLM output"}
+        assert Genome(prompt=parsed).prompt is parsed
+        
     def test_revenue_distribution_40_40_20(self, revenue_attribution):
         """Revenue should be distributed according to 40/40/20 rule"""
         orchestrator = EvolutionOrchestrator(
@@ -165,7 +195,7 @@ class TestEvolutionEconomyIntegration:
 class TestFullCycleIntegration:
     """Test complete end-to-end cycle"""
     
-    def test_full_agent_lifecycle(self, groq_api_key, credits_system, accounting_system, revenue_attribution):
+    def test_full_agent_lifecycle(self, fake_llm, credits_system, accounting_system, revenue_attribution):
         """Test complete lifecycle: create → act → record costs → generate revenue → calculate fitness"""
         
         # 1. Create agent with economy
@@ -175,9 +205,9 @@ class TestFullCycleIntegration:
         
         agent = BaseAgent(
             genome=genome,
-            groq_api_key=groq_api_key,
             credits_system=credits_system,
-            accounting_system=accounting_system
+            accounting_system=accounting_system,
+            llm_manager=fake_llm
         )
         
         # 2. Agent performs action (incurs cost)
@@ -189,7 +219,7 @@ class TestFullCycleIntegration:
         assert result['success'] == True
         
         # 3. Verify API cost recorded
-        api_expenses = [e for e in accounting_system.expenses if e.category == "api_calls"]
+        api_expenses = accounting_system.get_expenses(ExpenseCategory.API_COSTS)
         assert len(api_expenses) > 0
         initial_cost = agent.get_total_costs()
         assert initial_cost > 0
@@ -212,7 +242,7 @@ class TestFullCycleIntegration:
         balance = agent.get_wallet_balance()
         assert balance >= 0
         
-    def test_multi_agent_generation_cycle(self, groq_api_key, credits_system, accounting_system, revenue_attribution):
+    def test_multi_agent_generation_cycle(self, fake_llm, credits_system, accounting_system, revenue_attribution):
         """Test full generation with multiple agents and revenue distribution"""
         
         # Create 3 agents
@@ -221,9 +251,9 @@ class TestFullCycleIntegration:
             genome = Genome(prompt=f"You are agent {i}")
             agent = BaseAgent(
                 genome=genome,
-                groq_api_key=groq_api_key,
                 credits_system=credits_system,
-                accounting_system=accounting_system
+                accounting_system=accounting_system,
+                llm_manager=fake_llm
             )
             agents.append(agent)
         
@@ -239,6 +269,11 @@ class TestFullCycleIntegration:
             # Generate revenue
             agent._record_revenue(revenue, "earnings")
         
+        # Agent metrics and the credits ledger agree
+        for agent, revenue in zip(agents, revenues):
+            assert agent.get_total_revenue() == revenue
+            assert credits_system.get_agent_revenue(agent.agent_id) == revenue
+        
         # Calculate fitness for all
         agents_data = []
         for agent in agents:
@@ -273,46 +308,49 @@ class TestAccountingAutomation:
     
     def test_budget_tracking(self, accounting_system):
         """Accounting should track budget usage"""
-        # Set budget
-        accounting_system.set_monthly_budget("api_calls", 100.0)
+        budget = accounting_system.budgets[ExpenseCategory.API_COSTS]
         
         # Record expense
         accounting_system.record_expense(
-            amount=25.0,
-            category="api_calls",
+            category=ExpenseCategory.API_COSTS,
+            amount=budget.allocated * 0.25,
             description="Test expense"
         )
         
         # Check budget status
-        usage = accounting_system.get_budget_usage("api_calls")
-        assert usage == 0.25  # 25/100
+        usage = accounting_system.get_budget_usage(ExpenseCategory.API_COSTS)
+        assert usage == pytest.approx(0.25)
         
     def test_budget_alert(self, accounting_system):
         """Should alert when budget exceeded"""
-        accounting_system.set_monthly_budget("api_calls", 100.0)
+        budget = accounting_system.budgets[ExpenseCategory.API_COSTS]
         
         # Spend within budget
-        accounting_system.record_expense(50.0, "api_calls", "Test 1")
-        assert not accounting_system.check_budget_exceeded("api_calls")
+        accounting_system.record_expense(ExpenseCategory.API_COSTS, budget.allocated * 0.5, "Test 1")
+        assert not accounting_system.check_budget_exceeded(ExpenseCategory.API_COSTS)
         
         # Exceed budget
-        accounting_system.record_expense(60.0, "api_calls", "Test 2")
-        assert accounting_system.check_budget_exceeded("api_calls")
+        accounting_system.record_expense(ExpenseCategory.API_COSTS, budget.allocated * 0.6, "Test 2")
+        assert accounting_system.check_budget_exceeded(ExpenseCategory.API_COSTS)
         
-    def test_daily_report_generation(self, accounting_system):
-        """Should generate comprehensive daily report"""
+    def test_daily_report_generation(self, accounting_system, revenue_attribution):
+        """Should generate comprehensive financial report"""
         # Record some activity
-        accounting_system.record_expense(50.0, "api_calls", "API usage")
-        accounting_system.record_revenue(200.0, "sales", "Product sales")
+        accounting_system.record_expense(ExpenseCategory.API_COSTS, 50.0, "API usage")
+        revenue_attribution.record_fitness_event(
+            fitness_score=1.0,
+            revenue_generated=200.0,
+            contributors=[
+                AgentContribution("seller", "sales", 1.0, 1, datetime.now())
+            ]
+        )
         
-        report = accounting_system.generate_daily_report()
+        report = accounting_system.generate_financial_report()
+        summary = report['summary']
         
-        assert 'total_revenue' in report
-        assert 'total_expenses' in report
-        assert 'net_profit' in report
-        assert report['total_revenue'] == 200.0
-        assert report['total_expenses'] == 50.0
-        assert report['net_profit'] == 150.0
+        assert summary['total_revenue'] == 200.0
+        assert summary['total_expenses'] == 50.0
+        assert summary['total_revenue'] - summary['total_expenses'] == 150.0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+"""
+Tests del Slave Server (app.distributed.slave_server)
+Ejecuta la API Flask con app.test_client(), sin red ni Docker
+"""
+
+import json
+import subprocess
+import time
+
+import pytest
+
+from app.distributed import slave_server
+
+
+AUTH = {"Authorization": f"Bearer {slave_server.SLAVE_TOKEN}"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de test forzado a ejecutar con el Python nativo"""
+    monkeypatch.setattr(
+        slave_server,
+        "_get_available_methods",
+        lambda: {"docker": False, "venv": False, "python": True}
+    )
+    slave_server.app.config["TESTING"] = True
+    return slave_server.app.test_client()
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Registra los procesos lanzados por slave_server con subprocess.Popen"""
+    processes = []
+    real_popen = subprocess.Popen
+    
+    def _popen(*args, **kwargs):
+        process = real_popen(*args, **kwargs)
+        processes.append(process)
+        return process
+    
+    monkeypatch.setattr(slave_server.subprocess, "Popen", _popen)
+    return processes
+
+
+def _records(response):
+    """Decodifica un cuerpo NDJSON: un objeto JSON por línea"""
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+# ============================================================
+# /api/execute
+# ============================================================
+
+class TestExecute:
+    """Tests del endpoint /api/execute"""
+    
+    def test_requires_token(self, client):
+        """Test: Sin token válido responde 401"""
+        response = client.post("/api/execute", json={"command": "print(1)"})
+        assert response.status_code == 401
+    
+    def test_non_stream_returns_json_result(self, client):
+        """Test: Sin "stream" devuelve el JSON de siempre con la salida completa"""
+        response = client.post("/api/execute", json={"command": "print('hola')"}, headers=AUTH)
+        
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "success": True,
+            "output": "hola\n",
+            "error": "",
+            "method": "python"
+        }
+    
+    def test_stream_emits_one_json_object_per_line(self, client):
+        """Test: Con "stream" cada línea del cuerpo es un objeto JSON"""
+        command = "import sys; print('a'); print('b'); print('c', file=sys.stderr)"
+        response = client.post(
+            "/api/execute",
+            json={"command": command, "stream": True},
+            headers=AUTH
+        )
+        
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        
+        records = _records(response)
+        output = [r for r in records if "stream" in r]
+        assert [r["line"] for r in output if r["stream"] == "stdout"] == ["a\n", "b\n"]
+        assert [r["line"] for r in output if r["stream"] == "stderr"] == ["c\n"]
+    
+    def test_stream_final_record_has_exit_code(self, client):
+        """Test: El último registro lleva el código de salida del proceso"""
+        response = client.post(
+            "/api/execute",
+            json={"command": "import sys; sys.exit(3)", "stream": True},
+            headers=AUTH
+        )
+        
+        final = _records(response)[-1]
+        assert final == {"success": False, "exit_code": 3, "method": "python"}
+    
+    def test_stream_timeout_kills_child(self, client, spawned, monkeypatch):
+        """Test: Al vencer EXECUTION_TIMEOUT se mata el proceso y se emite un error"""
+        monkeypatch.setattr(slave_server, "EXECUTION_TIMEOUT", 1)
+        command = "import time; print('start', flush=True); time.sleep(30)"
+        
+        started = time.monotonic()
+        response = client.post(
+            "/api/execute",
+            json={"command": command, "stream": True},
+            headers=AUTH
+        )
+        records = _records(response)
+        
+        assert time.monotonic() - started < 10
+        assert records[0] == {"stream": "stdout", "line": "start\n"}
+        assert records[-1]["success"] is False
+        assert records[-1]["exit_code"] is None
+        assert "timed out" in records[-1]["error"]
+        
+        # El hijo está muerto y recogido (sin zombie)
+        [process] = spawned
+        assert process.returncode is not None
+        assert process.returncode != 0
+
+
+# ============================================================
+# /api/tail
+# ============================================================
+
+class _FakeTail:
+    """Popen falso de tail -F: stdout infinito y registro de terminate/wait"""
+    
+    def __init__(self, argv, **kwargs):
+        self.argv = argv
+        self.stdout = iter(lambda: "line\n", None)
+        self.terminated = False
+        self.waited = False
+    
+    def terminate(self):
+        self.terminated = True
+    
+    def wait(self, timeout=None):
+        self.waited = True
+        return 0
+    
+    def kill(self):
+        pass
+
+
+class TestTail:
+    """Tests del endpoint /api/tail"""
+    
+    @pytest.mark.parametrize("lines", ["abc", "1.5", "-5"])
+    def test_invalid_lines_returns_400(self, client, tmp_path, lines):
+        """Test: "lines" no entero o negativo responde 400"""
+        log = tmp_path / "d8.log"
+        log.write_text("a\n")
+        
+        response = client.get("/api/tail", query_string={"path": str(log), "lines": lines}, headers=AUTH)
+        
+        assert response.status_code == 400
+    
+    def test_missing_file_returns_404(self, client, tmp_path):
+        """Test: Un archivo inexistente responde 404 sin lanzar tail"""
+        response = client.get("/api/tail", query_string={"path": str(tmp_path / "nope.log")}, headers=AUTH)
+        
+        assert response.status_code == 404
+    
+    def test_disconnect_terminates_and_waits(self, client, tmp_path, monkeypatch):
+        """Test: Cerrar la respuesta termina tail y espera al proceso (sin zombie)"""
+        log = tmp_path / "d8.log"
+        log.write_text("a\n")
+        spawned = []
+        
+        def _popen(argv, **kwargs):
+            spawned.append(_FakeTail(argv, **kwargs))
+            return spawned[-1]
+        
+        monkeypatch.setattr(slave_server.subprocess, "Popen", _popen)
+        
+        response = client.get(
+            "/api/tail",
+            query_string={"path": str(log), "lines": "10"},
+            headers=AUTH,
+            buffered=False
+        )
+        chunks = response.iter_encoded()
+        assert next(chunks) == b"line\n"
+        response.close()
+        
+        [tail] = spawned
+        assert tail.argv == ["tail", "-n", "10", "-F", str(log)]
+        assert tail.terminated
+        assert tail.waited